@@ -0,0 +1 @@
+# Lets the tests import crypto173 and the Helper modules from this directory.
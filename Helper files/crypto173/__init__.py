@@ -0,0 +1,103 @@
+'''Shared, fast implementations of the Math 173A cryptography helpers.
+
+The Lab helper files import from here, so a fix or speed-up only has to be made once.
+
+The core cipher API (see core.py) only needs the standard library and is imported right
+away.  Everything else is imported the first time it is used, so that
+`from crypto173 import shift_string` does not pay for loading NumPy, pandas or Altair.
+'''
+import importlib
+
+from .core import (
+    english_freq,
+    letter_bytes,
+    only_letters,
+    string_for_code_block,
+    add_spaces,
+    letters_per_line,
+    iter_lines,
+    count_lines,
+    format_page,
+    shift_char,
+    shift_string,
+    all_shift_strings,
+    weave,
+    to_base_b,
+    from_base_b,
+    factor_out_2,
+    count_substrings,
+    get_freq,
+    mut_ind_co,
+    ind_co,
+    kasiski_diffs,
+    freq_chart,
+)
+
+# Maps each lazily imported name to the module that defines it.
+_LAZY = {
+    "normalize": [
+        "to_codes", "from_codes", "iter_codes", "iter_file_codes", "file_codes",
+    ],
+    "shift": ["shift_codes", "all_shifts"],
+    "ngrams": [
+        "ngram_codes", "ngram_counts", "sparse_ngram_counts", "ngram_counter", "ngram_strings",
+    ],
+    "corpus_stats": ["build_tables", "save_tables", "load_tables", "ngram_freq"],
+    "mic": ["freq_vector", "as_freq_vector", "mut_ind_co_vectors", "mut_ind_co_shifts"],
+    "shift_crack": ["ShiftCrack", "score_shift_batch", "crack_shift_batch", "crack_shifts"],
+    "kasiski": ["kasiski_key_lengths", "repeat_index", "iter_spacings", "divisor_counts"],
+    "keylength": ["periodic_ic", "ic_key_lengths", "estimate_key_length"],
+    "vigenere": [
+        "VigenereSolution", "column_shifts", "vigenere_decrypt", "solve_vigenere",
+        "solve_vigenere_batch",
+    ],
+    "memo": ["text_digest", "DigestCache", "digest_cache"],
+    "charts": ["bar_chart", "top_k", "ngram_chart", "mic_chart"],
+    "bases": ["to_base_b_array", "from_base_b_array"],
+    "blocks": ["block_size", "encode_blocks", "encode_file", "decode_blocks", "decode_string"],
+    "primes": [
+        "small_primes", "miller_rabin", "is_prime", "is_prime_array", "random_prime",
+        "random_primes",
+    ],
+    "modular": [
+        "egcd", "mod_inverse", "crt", "mod_pow_array", "egcd_array", "mod_inverse_array",
+        "crt_array",
+    ],
+    "factorization": [
+        "Factorization", "trial_division", "pollard_p_minus_1", "pollard_rho", "factor",
+        "factor_batch",
+    ],
+    "discrete_log": [
+        "BabyStepTable", "element_order", "DiscreteLogSolver", "discrete_log",
+        "discrete_log_batch",
+    ],
+    "corpus_store": [
+        "Corpus", "normalize_text", "build_store", "open_corpus", "corpus_from_text", "excerpt",
+        "sample_excerpt",
+    ],
+    "substitution": [
+        "SubstitutionSolution", "quadgram_log_probs", "quadgram_score", "substitution_decrypt",
+        "substitution_encrypt", "random_substitution_key", "frequency_key", "hill_climb",
+        "solve_substitution", "solve_substitution_batch",
+    ],
+    "challenges": [
+        "Challenges", "iter_challenges", "generate_challenges", "join_challenges",
+        "challenge_strings", "write_challenges", "read_challenges",
+    ],
+    "rolling": ["WindowStats", "ChangePoint", "RollingCounts", "rolling_stats", "change_points"],
+}
+_LAZY_NAMES = {name: module for module, names in _LAZY.items() for name in names}
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY_NAMES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
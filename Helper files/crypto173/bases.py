@@ -0,0 +1,176 @@
+'''Converting integers to and from their digits in base b.
+
+Large numbers are split in half by divide-and-conquer: to find the digits of num, we
+divide by the largest cached power base^(2^k) below it and convert the quotient and
+remainder separately; going the other way, the two halves of the digit list are
+combined with one multiplication.  The powers base^(2^k) are computed once per base
+and cached.  Python multiplies big integers with Karatsuba's algorithm, so
+from_base_b is subquadratic; to_base_b replaces thousands of Python-level divisions
+by a small number with a few dozen big divisions, which is much faster in practice.
+
+For bases that are powers of 2 the digits are read directly from the bits.
+
+Only the bulk functions, which work with NumPy arrays, import NumPy.
+'''
+import functools
+import operator
+
+# Below this many bits, the simple one-digit-at-a-time algorithms are faster.
+SMALL_BITS = 256
+
+
+@functools.lru_cache(maxsize=64)
+def _powers(base, count):
+    '''Returns [base, base^2, base^4, ..., base^(2^(count-1))].'''
+    if count == 1:
+        return (base,)
+    smaller = _powers(base, count - 1)
+    return smaller + (smaller[-1] * smaller[-1],)
+
+
+def _power_table(base, bits):
+    '''Returns the powers base^(2^k) up to the first one with more than `bits` bits.'''
+    count = 1
+    while True:
+        table = _powers(base, count)
+        if table[-1].bit_length() > bits:
+            return table
+        count += 1
+
+
+def to_base_b(num, base):
+    '''Returns the digits of `num` when written in base `base`.'''
+    # Accept NumPy integers (from rng.integers, say), which have no bit_length.
+    num, base = operator.index(num), operator.index(base)
+    if num <= 0:
+        return []
+    if base & (base - 1) == 0 and base > 1:
+        return _to_power_of_2(num, base)
+    if num.bit_length() <= SMALL_BITS:
+        return _to_base_b_small(num, base)
+    table = _power_table(base, num.bit_length())
+    digits = []
+    _split(num, len(table) - 1, table, digits, pad=False)
+    return digits
+
+
+def from_base_b(digit_list, base):
+    '''Converts from a list of digits in base `base` to an integer.'''
+    base = operator.index(base)
+    # NumPy digits would overflow when multiplied up, so make them Python ints.
+    digit_list = list(map(operator.index, digit_list))
+    if len(digit_list) <= 64:
+        num = 0
+        for d in digit_list:
+            num = num*base + d
+        return num
+    k = (len(digit_list) - 1).bit_length() - 1
+    return _join(digit_list, k, _powers(base, k + 1))
+
+
+def _to_base_b_small(num, base):
+    '''Adapted from code on Stack Overflow.'''
+    digits = []
+    while num > 0:
+        num, rem = divmod(num, base)
+        digits.append(rem)
+    return digits[::-1]
+
+
+def _to_power_of_2(num, base):
+    bits = base.bit_length() - 1
+    mask = base - 1
+    count = -(-num.bit_length() // bits)
+    return [(num >> (bits * i)) & mask for i in range(count - 1, -1, -1)]
+
+
+def _split(num, k, table, digits, pad):
+    '''Appends the digits of num to `digits`, where num < base^(2^(k+1)).
+    If pad is True, exactly 2^(k+1) digits are appended (with leading zeros).'''
+    if k < 0 or table[k].bit_length() <= SMALL_BITS:
+        small = _to_base_b_small(num, table[0]) if num else []
+        if pad:
+            digits.extend([0] * (2**(k+1) - len(small)))
+        digits.extend(small)
+        return
+    high, low = divmod(num, table[k])
+    if high or pad:
+        _split(high, k - 1, table, digits, pad)
+        _split(low, k - 1, table, digits, pad=True)
+    else:
+        _split(low, k - 1, table, digits, pad)
+
+
+def _join(digit_list, k, table):
+    '''Returns the integer with digits digit_list, where len(digit_list) <= 2^(k+1).'''
+    if len(digit_list) <= 64:
+        num = 0
+        for d in digit_list:
+            num = num*table[0] + d
+        return num
+    # The last 2^k digits are the low half.
+    split = len(digit_list) - 2**k
+    if split <= 0:
+        return _join(digit_list, k - 1, table)
+    return _join(digit_list[:split], k - 1, table) * table[k] + _join(digit_list[split:], k - 1, table)
+
+
+def to_base_b_array(nums, base, width=None):
+    '''Returns a 2-dimensional NumPy array whose row i holds the digits of nums[i] in
+    base `base`, most significant first, padded on the left with zeros to `width`
+    digits (by default, the width of the largest number).  `nums` can be an array of
+    non-negative word-size integers, which is converted with vectorized arithmetic,
+    or a list of arbitrarily large Python ints.  Raises a ValueError for negative
+    numbers.'''
+    import numpy as np
+
+    base = operator.index(base)
+    nums_array = np.asarray(nums)
+    if nums_array.dtype.kind in "iu" and nums_array.size and nums_array.min() < 0:
+        raise ValueError("to_base_b_array needs non-negative numbers.")
+    if nums_array.dtype.kind in "iu":
+        if width is None:
+            width = max(_digit_count(int(nums_array.max(initial=0)), base), 1)
+        out = np.zeros((len(nums_array), width), dtype=np.int64)
+        rest = nums_array.astype(np.uint64)
+        for col in range(width - 1, -1, -1):
+            rest, out[:, col] = np.divmod(rest, np.uint64(base))
+        return out
+    if any(num < 0 for num in nums):
+        raise ValueError("to_base_b_array needs non-negative numbers.")
+    rows = [to_base_b(int(num), base) for num in nums]
+    if width is None:
+        width = max([len(row) for row in rows] + [1])
+    dtype = np.int64 if base <= 2**62 else object
+    out = np.zeros((len(rows), width), dtype=dtype)
+    for i, row in enumerate(rows):
+        if len(row) > width:
+            raise ValueError(f"{nums[i]} has more than {width} digits in base {base}.")
+        if row:
+            out[i, width-len(row):] = row
+    return out
+
+
+def from_base_b_array(digits, base):
+    '''Converts each row of the 2-dimensional array `digits` (most significant digit
+    first) from base `base` to an integer.  Returns an int64 array if the results are
+    sure to fit in 63 bits, and an array of Python ints otherwise.'''
+    import numpy as np
+
+    base = operator.index(base)
+    digits = np.asarray(digits)
+    width = digits.shape[1]
+    if base**width <= 2**63:
+        out = np.zeros(len(digits), dtype=np.int64)
+        for col in range(width):
+            out = out * base + digits[:, col]
+        return out
+    return np.array([from_base_b(row, base) for row in digits.tolist()] or [], dtype=object)
+
+
+def _digit_count(num, base):
+    count = 0
+    while num > 0:
+        num //= base
+        count += 1
+    return count
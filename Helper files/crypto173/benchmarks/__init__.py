@@ -0,0 +1 @@
+'''Benchmarks for the crypto173 package.  Each module can be run with python -m.'''
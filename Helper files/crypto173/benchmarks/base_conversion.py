@@ -0,0 +1,65 @@
+'''Times to_base_b and from_base_b against the original one-digit-at-a-time versions.
+
+    python -m crypto173.benchmarks.base_conversion [--bits 512 2048 8192 32768] [--base 10]
+
+For each size, a random integer with that many bits is converted to base `base` and
+back, and the median time of several runs is reported for both implementations.
+'''
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from crypto173.bases import to_base_b, from_base_b
+
+
+def reference_to_base_b(num, base):
+    digits = []
+    while num > 0:
+        num, rem = divmod(num, base)
+        digits.append(rem)
+    return digits[::-1]
+
+
+def reference_from_base_b(digit_list, base):
+    return sum(d*base**i for i, d in enumerate(digit_list[::-1]))
+
+
+def median_time(func, *args, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, nargs="+", default=[512, 2048, 8192, 32768])
+    parser.add_argument("--base", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=173)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f"{'bits':>7} {'to (old)':>12} {'to (new)':>12} {'from (old)':>12} {'from (new)':>12}")
+    for bits in args.bits:
+        num = rng.getrandbits(bits) | (1 << (bits - 1))
+        digits = to_base_b(num, args.base)
+        if digits != reference_to_base_b(num, args.base) or from_base_b(digits, args.base) != num:
+            print(f"Mismatch at {bits} bits.")
+            return 1
+        row = [
+            median_time(reference_to_base_b, num, args.base, repeat=args.repeat),
+            median_time(to_base_b, num, args.base, repeat=args.repeat),
+            median_time(reference_from_base_b, digits, args.base, repeat=args.repeat),
+            median_time(from_base_b, digits, args.base, repeat=args.repeat),
+        ]
+        print(f"{bits:>7}" + "".join(f"{t*1000:>10.3f}ms" for t in row))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+'''Measures the throughput of encode_blocks and decode_blocks.
+
+    python -m crypto173.benchmarks.blocks [--megabytes 8] [--bits 512 2048]
+
+Random bytes are encoded into blocks for a modulus of each size, decoded again, and
+checked against the original.  Reports MB/s for both directions.
+'''
+import argparse
+import random
+import sys
+import time
+
+from crypto173.blocks import encode_blocks, decode_blocks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=8)
+    parser.add_argument("--bits", type=int, nargs="+", default=[256, 1024, 2048, 4096])
+    parser.add_argument("--chunk-size", type=int, default=1 << 16)
+    parser.add_argument("--seed", type=int, default=173)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    size = int(args.megabytes * 2**20)
+    data = rng.randbytes(size)
+    chunks = [data[i:i+args.chunk_size] for i in range(0, size, args.chunk_size)]
+
+    print(f"{'bits':>6} {'encode':>12} {'decode':>12}")
+    for bits in args.bits:
+        modulus = rng.getrandbits(bits) | (1 << (bits - 1))
+        start = time.perf_counter()
+        blocks = list(encode_blocks(chunks, modulus))
+        encode_time = time.perf_counter() - start
+        start = time.perf_counter()
+        decoded = b"".join(decode_blocks(blocks, modulus))
+        decode_time = time.perf_counter() - start
+        if decoded != data:
+            print(f"Round trip failed for a {bits}-bit modulus.")
+            return 1
+        mb = size / 2**20
+        print(f"{bits:>6} {mb/encode_time:>7.1f} MB/s {mb/decode_time:>7.1f} MB/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
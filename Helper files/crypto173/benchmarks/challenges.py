@@ -0,0 +1,51 @@
+'''Measures how many challenges per second write_challenges produces.
+
+    python -m crypto173.benchmarks.challenges [--counts 10000 1000000] [--length 40 60]
+
+For each cipher and count, the challenges are written to a temporary directory and
+read back, and the keys are checked against the ones generated in memory.  Reports
+challenges per second and MB of ciphertext per second.
+'''
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from crypto173.challenges import CIPHERS, generate_challenges, read_challenges, write_challenges
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--length", type=int, nargs=2, default=[40, 60])
+    parser.add_argument("--ciphers", nargs="+", choices=CIPHERS, default=list(CIPHERS))
+    parser.add_argument("--seed", type=int, default=173)
+    args = parser.parse_args(argv)
+
+    settings = {"min_length": args.length[0], "max_length": args.length[1]}
+    print(f"{'cipher':>9} {'count':>9} {'challenges/s':>13} {'MB/s':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "challenges.txt")
+        for cipher in args.ciphers:
+            for count in args.counts:
+                start = time.perf_counter()
+                write_challenges(path, count, args.seed, cipher, **settings)
+                elapsed = time.perf_counter() - start
+                # Check the smallest set against the same challenges made in memory.
+                if count == min(args.counts):
+                    written = read_challenges(path)
+                    expected = generate_challenges(count, args.seed, cipher, **settings)
+                    if not (np.array_equal(written.codes, expected.codes)
+                            and np.array_equal(written.keys, expected.keys)):
+                        print(f"The {cipher} challenges did not read back correctly.")
+                        return 1
+                mb = os.path.getsize(path) / 2**20
+                print(f"{cipher:>9} {count:>9} {count/elapsed:>13,.0f} {mb/elapsed:>7.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
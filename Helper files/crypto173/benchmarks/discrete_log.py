@@ -0,0 +1,52 @@
+'''Times discrete logs modulo safe primes, one at a time and in a batch.
+
+    python -m crypto173.benchmarks.discrete_log [--bits 24 32 36 40] [--count 10]
+
+For a safe prime p = 2q + 1, Pohlig-Hellman cannot help, so almost all of the work is
+baby-step giant-step in the subgroup of order q.  discrete_log builds a new baby-step
+table for every log; discrete_log_batch builds it once for the whole batch.
+'''
+import argparse
+import random
+import sys
+import time
+
+from crypto173.discrete_log import discrete_log, discrete_log_batch
+from crypto173.primes import is_prime, random_prime
+
+
+def safe_prime(bits, rng):
+    while True:
+        q = random_prime(bits - 1, rng)
+        if is_prime(2*q + 1):
+            return 2*q + 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, nargs="+", default=[24, 32, 36, 40])
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=173)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f"{'bits':>5} {'one at a time':>16} {'batch':>16}")
+    for bits in args.bits:
+        p = safe_prime(bits, rng)
+        g = rng.randrange(2, p - 1)
+        hs = [pow(g, rng.randrange(p - 1), p) for _ in range(args.count)]
+        start = time.perf_counter()
+        single = [discrete_log(g, h, p) for h in hs]
+        single_time = (time.perf_counter() - start) / args.count
+        start = time.perf_counter()
+        batch = discrete_log_batch(g, hs, p)
+        batch_time = (time.perf_counter() - start) / args.count
+        if single != batch or any(pow(g, x, p) != h for x, h in zip(batch, hs)):
+            print(f"Wrong logs modulo {p}.")
+            return 1
+        print(f"{bits:>5} {single_time*1000:>10.1f} ms/log {batch_time*1000:>10.1f} ms/log")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
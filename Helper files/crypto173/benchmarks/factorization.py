@@ -0,0 +1,68 @@
+'''Times factor and factor_batch on semiprimes and on numbers built for p - 1.
+
+    python -m crypto173.benchmarks.factorization [--bits 16 24 32 40] [--count 10]
+
+For each size, `count` products of two random primes with that many bits are factored
+one at a time and then with factor_batch.  A 400-bit product of a random prime and a
+prime p with p - 1 smooth shows Pollard's p - 1 method at work.
+'''
+import argparse
+import random
+import sys
+import time
+
+from crypto173.factorization import factor, factor_batch
+from crypto173.primes import is_prime, random_prime, small_primes
+
+
+def smooth_prime(bits, bound, rng):
+    '''Returns a prime p with `bits` bits or slightly more, such that p - 1 is a product of
+    distinct primes below `bound` (apart from a single 2).'''
+    primes = small_primes(bound)[1:]
+    while True:
+        factors = set()
+        m = 2
+        while m.bit_length() < bits:
+            p = rng.choice(primes)
+            if p not in factors:
+                factors.add(p)
+                m *= p
+        if is_prime(m + 1):
+            return m + 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, nargs="+", default=[16, 24, 32, 40])
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--time-budget", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=173)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f"{'factor bits':>11} {'one process':>14} {'factor_batch':>14}")
+    for bits in args.bits:
+        numbers = [random_prime(bits, rng) * random_prime(bits, rng) for _ in range(args.count)]
+        start = time.perf_counter()
+        single = [factor(n, time_budget=args.time_budget) for n in numbers]
+        single_time = (time.perf_counter() - start) / args.count
+        start = time.perf_counter()
+        batch = factor_batch(numbers, workers=args.workers, time_budget=args.time_budget)
+        batch_time = (time.perf_counter() - start) / args.count
+        if args.time_budget is None and (batch != single or any(f.cofactor != 1 for f in batch)):
+            print(f"Factoring {bits}-bit semiprimes failed.")
+            return 1
+        print(f"{bits:>11} {single_time*1000:>11.2f} ms {batch_time*1000:>11.2f} ms")
+
+    p, q = smooth_prime(200, 50_000, rng), random_prime(200, rng)
+    start = time.perf_counter()
+    result = factor(p * q)
+    elapsed = time.perf_counter() - start
+    found = result.factors == sorted([(p, 1), (q, 1)])
+    print(f"400-bit semiprime with smooth p - 1: {elapsed*1000:.1f} ms ({'factored' if found else 'not factored'})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+'''Measures how long it takes a fresh Python process to import the helpers.
+
+    python -m crypto173.benchmarks.import_time
+
+Each statement is run in a new interpreter (so nothing is cached in sys.modules), and
+the median of several runs is reported, along with which heavy libraries it loaded.
+Exits with status 1 if importing the core cipher API loads NumPy, pandas or Altair, or
+takes longer than the budget.
+'''
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY = ["numpy", "pandas", "altair"]
+
+STATEMENTS = [
+    "from crypto173 import only_letters, shift_string, weave, to_base_b",
+    "import Lab2_Helper",
+    "import Lab1_Helper",
+    "import Helper3",
+    "import numpy",
+    "import pandas, altair",
+]
+
+CORE = STATEMENTS[0]
+
+_TEMPLATE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, *[name for name in {heavy!r} if name in sys.modules])
+"""
+
+HELPER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def time_import(statement, repeat=7):
+    '''Returns (median seconds, heavy modules loaded) for running `statement` in a
+    fresh interpreter, with the helper files directory on the path.'''
+    env = dict(os.environ, PYTHONPATH=HELPER_DIR)
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _TEMPLATE.format(statement=statement, heavy=HEAVY)],
+            env=env, cwd=HELPER_DIR, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+        loaded = out[1:]
+    return statistics.median(times), loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="fail if importing the core API takes longer than this")
+    args = parser.parse_args(argv)
+
+    ok = True
+    for statement in STATEMENTS:
+        seconds, loaded = time_import(statement, args.repeat)
+        print(f"{seconds*1000:9.1f} ms  {statement:<70} loads: {', '.join(loaded) or '-'}")
+        if statement == CORE and (loaded or seconds*1000 > args.budget_ms):
+            ok = False
+    if not ok:
+        print("The core cipher API is too slow to import.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+'''Measures the cost per element of the batched modular arithmetic functions.
+
+    python -m crypto173.benchmarks.modular [--size 200000] [--big-bits 2048]
+
+Each function is run on word-size inputs (the vectorized path) and on big moduli (the
+Python-int path), and compared with a Python loop calling pow or egcd on each entry.
+'''
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from crypto173.modular import (
+    egcd, mod_pow_array, mod_inverse_array, egcd_array, crt, crt_array,
+)
+
+
+def per_element(func, size, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) / size * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--big-size", type=int, default=100)
+    parser.add_argument("--big-bits", type=int, default=2048)
+    parser.add_argument("--seed", type=int, default=173)
+    args = parser.parse_args(argv)
+
+    gen = np.random.default_rng(args.seed)
+    n = args.size
+    bases = gen.integers(0, 2**32, n)
+    exponents = gen.integers(0, 2**32, n)
+    moduli = gen.integers(2, 2**32, n) | 1
+    primes = np.full(n, 4294967291)
+    small = gen.integers(1, 2**16, (n, 2)) | 1
+    residues = gen.integers(0, 2**40, (n, 1)) % small
+
+    rng = random.Random(args.seed)
+    m = args.big_size
+    big = [[rng.getrandbits(args.big_bits) for _ in range(m)] for _ in range(3)]
+
+    b, e, mod, p = bases.tolist(), exponents.tolist(), moduli.tolist(), primes.tolist()
+    rows = [
+        ("mod_pow_array", n, lambda: mod_pow_array(bases, exponents, moduli),
+         lambda: [pow(*t) for t in zip(b, e, mod)]),
+        ("mod_inverse_array", n, lambda: mod_inverse_array(bases, primes),
+         lambda: [pow(x, -1, y) for x, y in zip(b, p)]),
+        ("egcd_array", n, lambda: egcd_array(bases, moduli),
+         lambda: [egcd(x, y) for x, y in zip(b, mod)]),
+        ("crt_array", n, lambda: crt_array(residues, small),
+         lambda: [crt(r, s) for r, s in zip(residues.tolist(), small.tolist())]),
+        (f"mod_pow_array ({args.big_bits}-bit)", m, lambda: mod_pow_array(*big),
+         lambda: [pow(*t) for t in zip(*big)]),
+    ]
+    print(f"{'':<28} {'batched':>12} {'Python loop':>12}")
+    for name, size, batched, loop in rows:
+        fast, fast_ns = per_element(batched, size)
+        slow, slow_ns = per_element(loop, size)
+        if isinstance(fast, tuple):
+            fast = list(zip(*[a.tolist() for a in fast]))
+            slow = [tuple(t) for t in slow]
+        else:
+            fast = fast.tolist()
+        if fast != slow:
+            print(f"{name} does not match the Python loop.")
+            return 1
+        print(f"{name:<28} {fast_ns:>9.0f} ns {slow_ns:>9.0f} ns")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
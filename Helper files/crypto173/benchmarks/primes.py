@@ -0,0 +1,58 @@
+'''Times primality testing and random prime generation.
+
+    python -m crypto173.benchmarks.primes [--bits 512 1024 2048] [--count 8] [--workers 4]
+
+Reports how long random_prime takes per prime in this process and how many primes per
+second random_primes makes in a process pool, and compares is_prime_array with calling
+is_prime on each entry of an array of random 32- and 64-bit numbers.
+'''
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from crypto173.primes import is_prime, is_prime_array, random_prime, random_primes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--count", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--array-size", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=173)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f"{'bits':>6} {'one process':>14} {'pool':>14}")
+    for bits in args.bits:
+        start = time.perf_counter()
+        for _ in range(args.count):
+            random_prime(bits, rng=rng)
+        single = (time.perf_counter() - start) / args.count
+        start = time.perf_counter()
+        random_primes(args.count, bits, workers=args.workers, seed=args.seed)
+        pooled = (time.perf_counter() - start) / args.count
+        print(f"{bits:>6} {single:>10.3f} s/p {pooled:>10.3f} s/p")
+
+    gen = np.random.default_rng(args.seed)
+    for high in [2**32, 2**63]:
+        candidates = gen.integers(0, high, args.array_size, dtype=np.uint64)
+        start = time.perf_counter()
+        batch = is_prime_array(candidates)
+        batch_time = time.perf_counter() - start
+        start = time.perf_counter()
+        scalar = [is_prime(n) for n in candidates.tolist()]
+        scalar_time = time.perf_counter() - start
+        if batch.tolist() != scalar:
+            print("is_prime_array and is_prime disagree.")
+            return 1
+        print(f"below 2^{high.bit_length() - 1}: is_prime_array {args.array_size/batch_time:,.0f}/s, "
+              f"is_prime {args.array_size/scalar_time:,.0f}/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+'''Measures sliding-window statistics against recomputing every window from scratch.
+
+    python -m crypto173.benchmarks.rolling [--windows 100 500 2000] [--megaletters 4]
+
+For each window size, the IC and best MIC with English of every window of a stream of
+PridePrejudice.txt are found with rolling_stats, and for the first few thousand windows
+with ind_co and mut_ind_co_shifts.  Reports windows per second for both, and checks
+that they agree.
+'''
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from crypto173.corpus_stats import ngram_freq
+from crypto173.corpus_store import open_corpus
+from crypto173.keylength import ind_co
+from crypto173.mic import freq_vector, mut_ind_co_shifts
+from crypto173.rolling import rolling_stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--megaletters", type=float, default=4)
+    parser.add_argument("--scratch-windows", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    letters = np.array(open_corpus().letters)
+    size = int(args.megaletters * 1e6)
+    stream = np.resize(letters, size)
+    chunks = [stream[i:i + (1 << 20)] for i in range(0, size, 1 << 20)]
+    ref = ngram_freq(1)
+
+    print(f"{'window':>7} {'rolling':>16} {'from scratch':>16}")
+    for window in args.windows:
+        start = time.perf_counter()
+        stats = list(rolling_stats(chunks, window))
+        rolling_time = time.perf_counter() - start
+        count = args.scratch_windows
+        start = time.perf_counter()
+        ic = np.empty(count)
+        mic = np.empty(count)
+        for i in range(count):
+            codes = stream[i:i+window]
+            ic[i] = ind_co(codes)
+            mic[i] = mut_ind_co_shifts(freq_vector(codes), ref).max()
+        scratch_time = time.perf_counter() - start
+        first = stats[0]
+        if not (np.allclose(first.ic[:count], ic) and np.allclose(first.mic[:count], mic)):
+            print(f"rolling_stats disagrees with ind_co for a window of {window}.")
+            return 1
+        windows = sum(len(s.ends) for s in stats)
+        print(f"{window:>7} {windows/rolling_time:>10,.0f} win/s {count/scratch_time:>10,.0f} win/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+'''Measures solves per second for the substitution solver.
+
+    python -m crypto173.benchmarks.substitution [--lengths 100 500 1000 5000] [--count 5]
+
+For each length, `count` excerpts of PridePrejudice.txt are encrypted with random keys
+and solved.  Reports solves per second and the fraction of letters recovered, and
+compares the cost of scoring one swap incrementally with rescoring the whole text.
+'''
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from crypto173 import only_letters
+from crypto173.normalize import to_codes
+from crypto173.substitution import (
+    _Climber, quadgram_log_probs, quadgram_score, random_substitution_key,
+    solve_substitution, substitution_decrypt, substitution_encrypt,
+)
+
+HELPER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CORPUS = os.path.join(HELPER_DIR, "PridePrejudice.txt")
+
+
+def swap_costs(codes, rng, swaps=2000):
+    '''Returns the seconds per swap for rescoring only the windows touching the two
+    swapped letters, and for rescoring the whole text.'''
+    log_probs = quadgram_log_probs()
+    key = rng.permutation(26)
+    pairs = rng.integers(0, 26, (swaps, 2)).tolist()
+    climber = _Climber(codes, key, log_probs)
+    start = time.perf_counter()
+    for a, b in pairs:
+        climber.try_swap(a, b)
+    incremental = (time.perf_counter() - start) / swaps
+    start = time.perf_counter()
+    for a, b in pairs:
+        key[a], key[b] = key[b], key[a]
+        quadgram_score(substitution_decrypt(codes, key), log_probs)
+    full = (time.perf_counter() - start) / swaps
+    return incremental, full
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 500, 1000, 5000])
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--restarts", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=173)
+    args = parser.parse_args(argv)
+
+    with open(CORPUS, encoding="utf-8-sig") as f:
+        corpus = only_letters(f.read(), case="upper")
+    rng = np.random.default_rng(args.seed)
+    print(f"{'letters':>8} {'solves/s':>10} {'letters right':>14} {'swap (incr.)':>14} {'swap (full)':>13}")
+    for length in args.lengths:
+        correct = 0
+        elapsed = 0.0
+        for i in range(args.count):
+            start = rng.integers(0, len(corpus) - length)
+            plain = corpus[start:start + length]
+            cipher = substitution_encrypt(plain, random_substitution_key(rng))
+            solution = solve_substitution(
+                cipher, restarts=args.restarts, workers=args.workers, seed=args.seed + i)
+            elapsed += solution.seconds
+            correct += sum(a == b for a, b in zip(solution.plaintext, plain))
+        incremental, full = swap_costs(to_codes(cipher), rng)
+        print(f"{length:>8} {args.count/elapsed:>10.2f} {correct/(length*args.count):>14.1%} "
+              f"{incremental*1e6:>11.1f} us {full*1e6:>10.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
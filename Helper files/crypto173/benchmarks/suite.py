@@ -0,0 +1,174 @@
+'''Times the hot paths of the helpers and writes the results as JSON.
+
+    python -m crypto173.benchmarks.suite [--sizes 1KB 100KB 10MB] [--output results.json]
+    python -m crypto173.benchmarks.suite --compare baseline.json [--tolerance 1.25]
+
+The text functions run on slices of PridePrejudice.txt, repeated to reach each size
+(use --sizes 1KB 10KB 100KB 1MB 10MB 100MB for the full range).  The number functions
+run on random integers with each number of bits in --bits.  For every case the median
+wall time is recorded, along with the peak memory allocated during one more call,
+measured with tracemalloc (which also sees NumPy's buffers).
+
+The JSON file has one entry per case, keyed by "function/input size", so two runs can
+be diffed.  With --compare, cases that got slower by more than the tolerance factor
+are listed and the exit status is 1.
+'''
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from crypto173 import (
+    only_letters, shift_string, count_substrings, get_freq, ind_co, kasiski_diffs, weave,
+    to_base_b, from_base_b, factor_out_2,
+)
+
+HELPER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CORPUS = os.path.join(HELPER_DIR, "PridePrejudice.txt")
+
+_UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+# Each text case is (name, function of the text, largest size to run it on).
+# kasiski_diffs returns every distance between repeated trigrams, which grows with the
+# square of the length for English text, so it stops early.
+TEXT_CASES = [
+    ("only_letters", only_letters, None),
+    ("shift_string", lambda X: shift_string(X, 3), None),
+    *[(f"count_substrings_n{n}", lambda X, n=n: count_substrings(X, n), None) for n in range(1, 5)],
+    ("get_freq", get_freq, None),
+    ("ind_co", ind_co, None),
+    ("kasiski_diffs", kasiski_diffs, 100 << 10),
+    ("weave", lambda X: weave([X[i::5] for i in range(5)]), None),
+]
+
+# Each number case is (name, function of a random number with the given bits).
+NUMBER_CASES = [
+    ("to_base_b", lambda num: to_base_b(num, 10)),
+    ("from_base_b", lambda digits: from_base_b(digits, 10)),
+    ("factor_out_2", factor_out_2),
+]
+
+
+def parse_size(text):
+    '''Turns a size like "10MB" into a number of bytes.'''
+    text = text.strip().upper()
+    for unit in sorted(_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * _UNITS[unit])
+    return int(text)
+
+
+def format_size(size):
+    for unit in ["GB", "MB", "KB"]:
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def corpus_slice(size, path=CORPUS):
+    '''Returns the first `size` characters of the corpus, repeated if it is too short.'''
+    with open(path, encoding="utf-8-sig") as f:
+        text = f.read()
+    copies = -(-size // len(text))
+    return (text * copies)[:size]
+
+
+def measure(func, arg, min_time=0.2, max_repeat=25):
+    '''Returns (median seconds, number of runs, peak bytes) for func(arg).'''
+    start = time.perf_counter()
+    func(arg)
+    times = [time.perf_counter() - start]
+    repeat = max(1, min(max_repeat, int(min_time / max(times[0], 1e-9))))
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), len(times), peak
+
+
+def run(sizes, bits, seed=173, log=print):
+    '''Runs every case and returns the results dictionary that is written as JSON.'''
+    results = {}
+
+    def record(name, label, func, arg):
+        seconds, runs, peak = measure(func, arg)
+        results[f"{name}/{label}"] = {"seconds": seconds, "runs": runs, "peak_bytes": peak}
+        log(f"{name:<22} {label:>8} {seconds*1000:>12.3f} ms {peak/2**20:>10.2f} MB")
+
+    for size in sizes:
+        text = corpus_slice(size)
+        for name, func, max_size in TEXT_CASES:
+            if max_size is None or size <= max_size:
+                record(name, format_size(size), func, text)
+    rng = random.Random(seed)
+    for b in bits:
+        num = rng.getrandbits(b) | (1 << (b - 1))
+        args = {
+            "to_base_b": num,
+            "from_base_b": to_base_b(num, 10),
+            # Give factor_out_2 some powers of 2 to remove.
+            "factor_out_2": num << rng.randrange(b),
+        }
+        for name, func in NUMBER_CASES:
+            record(name, f"{b}bit", func, args[name])
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(new, old, tolerance):
+    '''Returns the list of (case, old seconds, new seconds) for the cases that are
+    slower in `new` than in `old` by more than the factor `tolerance`.'''
+    slower = []
+    for case, entry in new["results"].items():
+        before = old["results"].get(case)
+        if before and entry["seconds"] > tolerance * before["seconds"]:
+            slower.append((case, before["seconds"], entry["seconds"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["1KB", "100KB", "10MB"])
+    parser.add_argument("--bits", type=int, nargs="+", default=[64, 2048, 32768])
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="a JSON file from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument("--seed", type=int, default=173)
+    args = parser.parse_args(argv)
+
+    print(f"{'function':<22} {'input':>8} {'median time':>15} {'peak memory':>13}")
+    results = run([parse_size(s) for s in args.sizes], args.bits, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(results, json.load(f), args.tolerance)
+        for case, before, after in slower:
+            print(f"Slower: {case} took {after*1000:.3f} ms, was {before*1000:.3f} ms")
+        if slower:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
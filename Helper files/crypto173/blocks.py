@@ -0,0 +1,89 @@
+'''Splitting messages into integer blocks below a modulus, for RSA-style encryption.
+
+The message is encoded as bytes, and cut into blocks of k bytes, where k is the
+largest number with 256^k <= modulus.  Each block is read as a base-256 number, so
+every block is less than 256^k, and so less than the modulus.  To mark where the message ends, the byte 0x80
+and then enough zero bytes to fill the last block are appended (so a message whose
+length is a multiple of k gets one extra block).  Decoding reverses this exactly.
+
+Both directions are generators, so a large file can be encrypted while only holding
+one chunk of it in memory.
+'''
+import codecs
+
+PAD_MARKER = 0x80
+
+
+def block_size(modulus):
+    '''Returns the number of bytes in each block for `modulus`: the largest k with
+    256^k <= modulus.'''
+    # 256^k <= modulus exactly when 8k is less than the number of bits of modulus.
+    k = (modulus.bit_length() - 1) // 8
+    if k < 1:
+        raise ValueError("The modulus should be at least 256.")
+    return k
+
+
+def _byte_chunks(message, encoding):
+    '''Yields the message as bytes, a chunk at a time.  `message` can be a string,
+    bytes, or an iterable of strings or bytes (such as an open file).'''
+    if isinstance(message, str):
+        message = [message]
+    elif isinstance(message, (bytes, bytearray, memoryview)):
+        message = [message]
+    encoder = codecs.getincrementalencoder(encoding)()
+    for chunk in message:
+        if isinstance(chunk, str):
+            chunk = encoder.encode(chunk)
+        yield chunk
+    yield encoder.encode("", final=True)
+
+
+def encode_blocks(message, modulus, encoding="utf-8"):
+    '''Yields the integer blocks for `message`, each less than `modulus`.
+    `message` can be a string, bytes, or an iterable of strings or bytes.'''
+    k = block_size(modulus)
+    buffer = b""
+    for chunk in _byte_chunks(message, encoding):
+        if buffer:
+            chunk = buffer + bytes(chunk)
+        full = len(chunk) - len(chunk) % k
+        view = memoryview(chunk)
+        for i in range(0, full, k):
+            yield int.from_bytes(view[i:i+k], "big")
+        buffer = bytes(view[full:])
+    yield int.from_bytes(buffer + bytes([PAD_MARKER]) + bytes(k - 1 - len(buffer)), "big")
+
+
+def encode_file(path, modulus, chunk_size=1 << 16):
+    '''Yields the integer blocks for the contents of the file at `path`.'''
+    with open(path, "rb") as f:
+        yield from encode_blocks(iter(lambda: f.read(chunk_size), b""), modulus)
+
+
+def decode_blocks(blocks, modulus):
+    '''Yields the bytes of the message, one block at a time, from the integer blocks
+    made by encode_blocks.'''
+    k = block_size(modulus)
+    limit = 256**k
+    previous = None
+    for block in blocks:
+        if not 0 <= block < limit:
+            raise ValueError(f"{block} is not a valid block for this modulus.")
+        if previous is not None:
+            yield previous.to_bytes(k, "big")
+        previous = block
+    if previous is None:
+        raise ValueError("There are no blocks to decode.")
+    last = previous.to_bytes(k, "big").rstrip(b"\x00")
+    if not last or last[-1] != PAD_MARKER:
+        raise ValueError("The last block does not end with padding.")
+    yield last[:-1]
+
+
+def decode_string(blocks, modulus, encoding="utf-8"):
+    '''Returns the string encoded in the integer blocks made by encode_blocks.'''
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pieces = [decoder.decode(chunk) for chunk in decode_blocks(blocks, modulus)]
+    pieces.append(decoder.decode(b"", final=True))
+    return "".join(pieces)
@@ -0,0 +1,259 @@
+'''Seeded generation of sets of shift, Vigenère and affine challenge ciphertexts.
+
+A set of challenges is made in one pass over numpy arrays: the lengths, the excerpt
+starts and the keys are drawn as arrays, every plaintext letter is read from the
+memory-mapped corpus store with one fancy index, and every letter is encrypted with
+one array expression.  Nothing is built one ciphertext at a time, so millions of
+challenges take seconds.
+
+    python -m crypto173.challenges strings.txt --count 20 --length 44 --cipher shift --seed 1
+
+writes one ciphertext per line, like strings20.txt, and the keys to strings.keys.txt.
+The same seed, count, lengths and cipher always give the same challenges.
+'''
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .corpus_store import DEFAULT_CORPUS, open_corpus
+
+CIPHERS = ("shift", "vigenere", "affine")
+AFFINE_MULTIPLIERS = np.array([1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25], dtype=np.uint8)
+CHUNK_SIZE = 1 << 16
+NEWLINE = 10
+
+Challenges = namedtuple("Challenges", ["cipher", "codes", "offsets", "keys", "key_offsets", "starts"])
+Challenges.__doc__ = '''A set of challenges.  The ciphertext letter codes are all in the
+flat array `codes`; challenge i is codes[offsets[i]:offsets[i+1]], and its plaintext
+starts at letter starts[i] of the corpus.  For shift ciphers keys[i] is the shift; for
+affine ciphers keys[i] is the pair (a, b) of the map x -> a*x + b; for Vigenère ciphers
+the key codes are in the flat array `keys`, with key i at keys[key_offsets[i]:key_offsets[i+1]].
+`key_offsets` is None for the other ciphers.'''
+
+
+def _generate(letters, count, rng, cipher, min_length, max_length, min_period, max_period):
+    lengths = rng.integers(min_length, max_length + 1, size=count)
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    total = int(offsets[-1])
+    starts = rng.integers(0, len(letters) - lengths + 1)
+    # Letter j of the set is letter j - offsets[i] of challenge i, which is
+    # corpus letter starts[i] + j - offsets[i].
+    item_of = np.repeat(np.arange(count), lengths)
+    positions = (starts - offsets[:-1])[item_of] + np.arange(total)
+    plain = letters[positions]
+
+    key_offsets = None
+    if cipher == "shift":
+        # A shift of 0 would leave the plaintext as it is.
+        keys = rng.integers(1, 26, size=count, dtype=np.uint8)
+        codes = plain + keys[item_of]
+    elif cipher == "vigenere":
+        periods = rng.integers(min_period, max_period + 1, size=count)
+        key_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(periods, out=key_offsets[1:])
+        keys = rng.integers(0, 26, size=int(key_offsets[-1]), dtype=np.uint8)
+        # Give any key of all As a letter other than A, so it changes the plaintext.
+        plain_keys = np.flatnonzero(np.add.reduceat(keys, key_offsets[:-1], dtype=np.int64) == 0)
+        if len(plain_keys):
+            places = key_offsets[plain_keys] + rng.integers(0, periods[plain_keys])
+            keys[places] = rng.integers(1, 26, size=len(plain_keys), dtype=np.uint8)
+        within = np.arange(total) - offsets[:-1][item_of]
+        codes = plain + keys[key_offsets[:-1][item_of] + within % periods[item_of]]
+    elif cipher == "affine":
+        # Pair number k is (AFFINE_MULTIPLIERS[k // 26], k % 26); pair 0 is the identity.
+        pairs = rng.integers(1, 26 * len(AFFINE_MULTIPLIERS), size=count)
+        keys = np.stack([AFFINE_MULTIPLIERS[pairs // 26], (pairs % 26).astype(np.uint8)], axis=1)
+        # a*x + b is at most 25*25 + 25, so do it in uint16.
+        codes = plain.astype(np.uint16) * keys[item_of, 0] + keys[item_of, 1]
+    else:
+        raise ValueError(f"cipher should be one of {', '.join(CIPHERS)}.")
+    codes = (codes % 26).astype(np.uint8)
+    return Challenges(cipher, codes, offsets, keys, key_offsets, starts)
+
+
+def iter_challenges(count, seed=None, cipher="shift", min_length=44, max_length=None,
+                    min_period=3, max_period=10, source=DEFAULT_CORPUS, chunk_size=CHUNK_SIZE):
+    '''Yields the `count` challenges as a sequence of Challenges, each holding at most
+    `chunk_size` of them.  Plaintexts are random excerpts of `source` (the path of a text
+    file, or a Corpus) with between `min_length` and `max_length` letters; Vigenère keys
+    have between `min_period` and `max_period` letters.  Each chunk has its own random
+    generator spawned from `seed`, so the challenges depend only on the arguments.'''
+    max_length = min_length if max_length is None else max_length
+    if cipher not in CIPHERS:
+        raise ValueError(f"cipher should be one of {', '.join(CIPHERS)}.")
+    if not 1 <= min_length <= max_length:
+        raise ValueError("The lengths should satisfy 1 <= min_length <= max_length.")
+    if not 1 <= min_period <= max_period:
+        raise ValueError("The periods should satisfy 1 <= min_period <= max_period.")
+    corpus = open_corpus(source) if isinstance(source, str) else source
+    if max_length > len(corpus.letters):
+        raise ValueError(f"The corpus only has {len(corpus.letters)} letters.")
+    chunks = -(-count // chunk_size)
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(chunks)):
+        size = min(chunk_size, count - i * chunk_size)
+        yield _generate(corpus.letters, size, np.random.default_rng(child), cipher,
+                        min_length, max_length, min_period, max_period)
+
+
+def generate_challenges(count, seed=None, cipher="shift", **kwargs):
+    '''Returns all `count` challenges as one Challenges.  Keyword arguments are passed
+    on to iter_challenges, and the result is the same as joining up its chunks.'''
+    return join_challenges(list(iter_challenges(count, seed, cipher, **kwargs)))
+
+
+def join_challenges(parts):
+    '''Joins a list of Challenges for the same cipher into one.'''
+    if not parts:
+        raise ValueError("There are no challenges to join.")
+
+    def join_offsets(offsets):
+        shifts = np.cumsum([0] + [int(o[-1]) for o in offsets[:-1]])
+        return np.concatenate([offsets[0][:1]] + [o[1:] + s for o, s in zip(offsets, shifts)])
+
+    key_offsets = None
+    if parts[0].key_offsets is not None:
+        key_offsets = join_offsets([p.key_offsets for p in parts])
+    return Challenges(
+        parts[0].cipher,
+        np.concatenate([p.codes for p in parts]),
+        join_offsets([p.offsets for p in parts]),
+        np.concatenate([p.keys for p in parts]),
+        key_offsets,
+        np.concatenate([p.starts for p in parts]),
+    )
+
+
+def challenge_strings(challenges, case="upper"):
+    '''Returns the ciphertexts of `challenges` as a list of strings.'''
+    text = _lines(challenges.codes, challenges.offsets, ord("A" if case == "upper" else "a"))
+    return text.decode("ascii").splitlines()
+
+
+def _lines(codes, offsets, base):
+    '''Returns the bytes of the codes with `base` added, with a newline after each item.'''
+    count = len(offsets) - 1
+    out = np.full(len(codes) + count, NEWLINE, dtype=np.uint8)
+    # Item i is moved along by the i newlines before it.
+    lengths = np.diff(offsets)
+    out[np.arange(len(codes)) + np.repeat(np.arange(count), lengths)] = codes + np.uint8(base)
+    return out.tobytes()
+
+
+def _two_digits(values):
+    values = np.asarray(values, dtype=np.uint8)
+    return np.stack([values // 10, values % 10], axis=1) + np.uint8(ord("0"))
+
+
+def _key_lines(challenges):
+    '''Returns the bytes of the key file lines: the shift as two digits, the Vigenère key
+    as capital letters, or the affine pair as two digits, a space and two digits.'''
+    cipher, keys = challenges.cipher, challenges.keys
+    if cipher == "vigenere":
+        return _lines(keys, challenges.key_offsets, ord("A"))
+    if cipher == "shift":
+        columns = [_two_digits(keys)]
+    else:
+        columns = [_two_digits(keys[:, 0]), np.full((len(keys), 1), ord(" "), np.uint8),
+                   _two_digits(keys[:, 1])]
+    columns.append(np.full((len(keys), 1), NEWLINE, np.uint8))
+    return np.concatenate(columns, axis=1).tobytes()
+
+
+def keys_path_for(path):
+    '''Returns the default path of the key file that goes with the ciphertext file `path`.'''
+    root, ext = os.path.splitext(path)
+    return f"{root}.keys{ext or '.txt'}"
+
+
+def write_challenges(path, count, seed=None, cipher="shift", keys_path=None, **kwargs):
+    '''Writes `count` challenges to the file `path`, one ciphertext of capital letters per
+    line (like strings20.txt), and their keys, one per line, to `keys_path` (by default
+    the same name with .keys before the extension).  The key file starts with a comment
+    line recording the arguments.  Keyword arguments are passed on to iter_challenges,
+    and only one chunk of challenges is in memory at a time.  Returns the two paths.'''
+    keys_path = keys_path_for(path) if keys_path is None else keys_path
+    if seed is None:
+        # Record a seed that reproduces the file.
+        seed = np.random.SeedSequence().entropy
+    settings = {"cipher": cipher, "seed": seed, "count": count, **kwargs}
+    settings.pop("source", None)
+    header = " ".join(f"{name}={value}" for name, value in settings.items())
+    with open(path, "wb") as out, open(keys_path, "wb") as keys_out:
+        keys_out.write(f"# {header}\n".encode("ascii"))
+        for chunk in iter_challenges(count, seed, cipher, **kwargs):
+            out.write(_lines(chunk.codes, chunk.offsets, ord("A")))
+            keys_out.write(_key_lines(chunk))
+    return path, keys_path
+
+
+def _read_lines(path):
+    '''Returns the letter codes and offsets of the lines of capital letters in `path`.'''
+    data = np.fromfile(path, dtype=np.uint8)
+    data = data[data != ord("\r")]
+    if len(data) and data[-1] != NEWLINE:
+        data = np.append(data, np.uint8(NEWLINE))
+    ends = np.flatnonzero(data == NEWLINE)
+    # Removing the newlines moves line i back by i places.
+    offsets = np.concatenate([[0], ends - np.arange(len(ends))]).astype(np.int64)
+    return data[data != NEWLINE] - np.uint8(ord("A")), offsets
+
+
+def read_challenges(path, keys_path=None):
+    '''Reads the files written by write_challenges back into a Challenges.  The starts
+    of the plaintexts are not saved, so `starts` is None.'''
+    keys_path = keys_path_for(path) if keys_path is None else keys_path
+    codes, offsets = _read_lines(path)
+    with open(keys_path, "rb") as f:
+        header = f.readline().decode("ascii")
+        body = np.frombuffer(f.read(), dtype=np.uint8)
+    body = body[body != ord("\r")]
+    settings = dict(item.split("=", 1) for item in header[1:].split())
+    cipher = settings["cipher"]
+    key_offsets = None
+    if cipher == "vigenere":
+        keys = body[body != NEWLINE] - np.uint8(ord("A"))
+        ends = np.flatnonzero(body == NEWLINE)
+        key_offsets = np.concatenate([[0], ends - np.arange(len(ends))]).astype(np.int64)
+    else:
+        # Every line has the same width; drop the newlines.
+        digits = body.reshape(len(offsets) - 1, -1)[:, :-1]
+        values = digits.astype(np.int64) - ord("0")
+        keys = (values[:, 0] * 10 + values[:, 1]).astype(np.uint8)
+        if cipher == "affine":
+            keys = np.stack([keys, (values[:, 3] * 10 + values[:, 4]).astype(np.uint8)], axis=1)
+    return Challenges(cipher, codes, offsets, keys, key_offsets, None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a seeded set of challenge ciphertexts.")
+    parser.add_argument("path")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cipher", choices=CIPHERS, default="shift")
+    parser.add_argument("--length", type=int, nargs="+", default=[44],
+                        help="a length, or the smallest and largest lengths")
+    parser.add_argument("--period", type=int, nargs=2, default=[3, 10],
+                        help="the smallest and largest Vigenère key lengths")
+    parser.add_argument("--keys", default=None, help="the key file (default: PATH with .keys)")
+    parser.add_argument("--source", default=DEFAULT_CORPUS)
+    args = parser.parse_args(argv)
+    if len(args.length) > 2:
+        parser.error("--length takes one or two numbers.")
+    start = time.perf_counter()
+    path, keys_path = write_challenges(
+        args.path, args.count, args.seed, args.cipher, keys_path=args.keys,
+        min_length=args.length[0], max_length=args.length[-1],
+        min_period=args.period[0], max_period=args.period[1], source=args.source)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.count} {args.cipher} challenges to {path} and their keys to "
+          f"{keys_path} in {elapsed:.2f} s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
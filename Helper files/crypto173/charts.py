@@ -0,0 +1,110 @@
+'''Altair charts of letter and n-gram frequencies.
+
+The chart specification for each kind of chart is built once and cached; drawing a
+chart only attaches a small list of records as its data.  The data is aggregated here
+rather than in the browser: an n-gram chart sends only the k most common n-grams plus
+one "other" bar, so its size does not grow with the 26^n possible n-grams.
+'''
+import functools
+import string
+
+import altair as alt
+import numpy as np
+
+from .core import get_freq, only_letters
+
+OTHER = "other"
+
+
+@functools.lru_cache(maxsize=None)
+def _bar_template(x, y, x_type, domain=None, sort=None, highlight=None):
+    '''Returns a bar chart with the given encoding and no data.'''
+    x_kwargs = {}
+    if domain is not None:
+        x_kwargs["scale"] = alt.Scale(domain=list(domain))
+    if sort == "given":
+        x_kwargs["sort"] = alt.EncodingSortField(field="order", order="ascending")
+    elif sort is not None:
+        x_kwargs["sort"] = sort
+    encoding = {
+        "x": alt.X(f"{x}:{x_type}", **x_kwargs),
+        "y": alt.Y(f"{y}:Q"),
+        "tooltip": [f"{x}:{x_type}", f"{y}:Q"],
+    }
+    if highlight is not None:
+        encoding["color"] = alt.condition(
+            alt.datum[y] > highlight,
+            alt.value("orange"),
+            alt.value("steelblue")
+        )
+    return alt.Chart(alt.Data(values=[])).mark_bar().encode(**encoding)
+
+
+def bar_chart(labels, values, x="letter", y="freq", x_type="N", domain=None, sort=None, highlight=None):
+    '''Returns a bar chart with one bar for each label.  If `domain` is given, it fixes
+    the order of the bars; `sort` can be "given" to keep the bars in the order of
+    `labels`, or "-y" to sort them by height.  Bars higher than `highlight` are
+    colored orange.'''
+    template = _bar_template(x, y, x_type, None if domain is None else tuple(domain), sort, highlight)
+    records = [{x: label, y: value} for label, value in zip(labels, np.asarray(values).tolist())]
+    if sort == "given":
+        for i, record in enumerate(records):
+            record["order"] = i
+    return template.properties(data=alt.Data(values=records))
+
+
+def top_k(counts, k):
+    '''Returns (indices, other), where indices are the positions of the k largest
+    entries of `counts`, largest first, and other is the sum of all the rest.'''
+    counts = np.asarray(counts)
+    k = min(k, len(counts))
+    if k < len(counts):
+        indices = np.argpartition(-counts, k)[:k]
+    else:
+        indices = np.arange(len(counts))
+    indices = indices[np.argsort(-counts[indices], kind="stable")]
+    return indices, counts.sum() - counts[indices].sum()
+
+
+def freq_chart(X, case="upper"):
+    '''Plot the letter frequency chart.'''
+    X = only_letters(X, case=case)
+    if case == "lower":
+        letters = string.ascii_lowercase
+    elif case == "upper":
+        letters = string.ascii_uppercase
+    else:
+        raise ValueError("case should be 'upper' or 'lower'.")
+
+    freq_dict = get_freq(X, case=case)
+    return bar_chart(list(letters), [freq_dict[c] for c in letters], domain=letters)
+
+
+def ngram_chart(X, n, k=20, case="upper"):
+    '''Plot the frequencies of the k most common n-grams in X, most common first,
+    with the remaining n-grams combined into a single "other" bar.'''
+    from .ngrams import ngram_counts, ngram_strings, sparse_ngram_counts
+
+    if n <= 5:
+        grams, counts = None, ngram_counts(X, n)
+    else:
+        grams, counts = sparse_ngram_counts(X, n)
+    total = counts.sum()
+    if total == 0:
+        raise ValueError(f"X does not contain any {n}-grams.")
+    indices, other = top_k(counts, k)
+    labels = ngram_strings(indices if grams is None else grams[indices], n, case)
+    values = counts[indices] / total
+    if other > 0:
+        labels.append(OTHER)
+        values = np.append(values, other / total)
+    return bar_chart(labels, values, x="ngram", sort="given")
+
+
+def mic_chart(scores, threshold=0.06):
+    '''Plot the Mutual Index of Coincidence for the shift amounts -25, ..., 25, where
+    scores[j] is the score for a shift of j (as returned by mut_ind_co_shifts).
+    Scores above `threshold` are highlighted.'''
+    shifts = np.arange(-25, 26)
+    return bar_chart(shifts, np.asarray(scores)[shifts % 26], x="shift_amount", y="score",
+                     x_type="O", highlight=threshold)
@@ -0,0 +1,260 @@
+'''The core cipher API, which the Lab helper files re-export.
+
+This module only uses the standard library, so importing it takes milliseconds.
+Functions that need NumPy, pandas or Altair import the module that implements them
+the first time they are called.
+'''
+import re
+import string
+import textwrap
+
+from .bases import to_base_b, from_base_b
+from .instrument import instrumented
+
+# Computed from "A Tale of Two Cities".  Compare Table 1.3 in Hoffstein, Pipher, Silverman.
+english_freq = {
+    'a': 0.0803,
+    'b': 0.014,
+    'c': 0.0232,
+    'd': 0.0467,
+    'e': 0.1247,
+    'f': 0.0226,
+    'g': 0.0209,
+    'h': 0.065,
+    'i': 0.0683,
+    'j': 0.0012,
+    'k': 0.008,
+    'l': 0.0367,
+    'm': 0.0255,
+    'n': 0.0706,
+    'o': 0.0776,
+    'p': 0.0166,
+    'q': 0.0011,
+    'r': 0.0621,
+    's': 0.0626,
+    't': 0.0902,
+    'u': 0.0279,
+    'v': 0.0087,
+    'w': 0.0236,
+    'x': 0.0012,
+    'y': 0.0203,
+    'z': 0.0004
+}
+
+_WHITESPACE = re.compile(r"\s")
+
+_LETTERS = string.ascii_letters.encode("ascii")
+_NON_LETTERS = bytes(b for b in range(256) if b not in _LETTERS)
+
+
+def _rotate(letters, shift_amt):
+    return letters[shift_amt:] + letters[:shift_amt]
+
+
+# _TABLES[s] shifts every letter by s, preserving case, and leaves everything else alone.
+_TABLES = [
+    str.maketrans(
+        string.ascii_lowercase + string.ascii_uppercase,
+        _rotate(string.ascii_lowercase, s) + _rotate(string.ascii_uppercase, s),
+    )
+    for s in range(26)
+]
+
+# The same tables for bytes.translate, which is much faster on ASCII text.
+_BYTE_TABLES = [
+    bytes.maketrans(
+        (string.ascii_lowercase + string.ascii_uppercase).encode("ascii"),
+        (_rotate(string.ascii_lowercase, s) + _rotate(string.ascii_uppercase, s)).encode("ascii"),
+    )
+    for s in range(26)
+]
+
+
+def letter_bytes(X):
+    '''Returns the ASCII letters in X (a str, bytes, or iterable of characters) as bytes.
+    Anything that is not an ASCII letter, including a byte order mark, is removed.'''
+    if isinstance(X, str):
+        # Non-ASCII characters can never be letters, so they are dropped here.
+        X = X.encode("ascii", "ignore")
+    elif not isinstance(X, (bytes, bytearray, memoryview)):
+        # Any other iterable of characters, such as a list of letters
+        X = ''.join(X).encode("ascii", "ignore")
+    return bytes(X).translate(None, _NON_LETTERS)
+
+
+@instrumented
+def only_letters(X, case=None):
+    '''Returns the string obtained from X by removing everything but the letters.
+    If case="upper" or case="lower", then the letters are all
+    converted to the same case.'''
+    X = letter_bytes(X).decode("ascii")
+
+    if len(X) == 0:
+        return None
+
+    if case is None:
+        return X
+    elif case == "lower":
+        return X.lower()
+    elif case == "upper":
+        return X.upper()
+
+
+def string_for_code_block(X, linewidth=60):
+    if _WHITESPACE.search(X) is None:
+        return '\n'.join(iter_lines(X, width=linewidth, linewidth=linewidth))
+    return '\n'.join(textwrap.wrap(X, width=linewidth))
+
+
+def add_spaces(X, width=5, linewidth=60):
+    # iter_lines needs text without whitespace, and groups no wider than a line.
+    if width <= linewidth and _WHITESPACE.search(X) is None:
+        return '\n'.join(iter_lines(X, width=width, linewidth=linewidth))
+    one_line = ' '.join(textwrap.wrap(X, width=width))
+    many_lines = string_for_code_block(one_line, linewidth=linewidth)
+    return many_lines
+
+
+def letters_per_line(width=5, linewidth=60):
+    '''Returns how many letters fit on a line of add_spaces(X, width, linewidth).'''
+    return max((linewidth + 1) // (width + 1), 1) * width
+
+
+def iter_lines(X, width=5, linewidth=60, start=0, stop=None):
+    '''Yields lines start, start + 1, ..., stop - 1 of add_spaces(X, width, linewidth),
+    one at a time, without formatting the rest of X.  X should not contain whitespace
+    (for example, it could come from only_letters), and width should be at most linewidth.
+    With width=linewidth, the lines are those of string_for_code_block(X, linewidth).'''
+    step = letters_per_line(width, linewidth)
+    num_lines = count_lines(X, width, linewidth)
+    stop = num_lines if stop is None else min(stop, num_lines)
+    for k in range(start, stop):
+        line = X[k*step:] if k == num_lines - 1 else X[k*step:(k+1)*step]
+        yield ' '.join(line[j:j+width] for j in range(0, len(line), width))
+
+
+def count_lines(X, width=5, linewidth=60):
+    '''Returns the number of lines in add_spaces(X, width, linewidth), for X as in iter_lines.'''
+    step = letters_per_line(width, linewidth)
+    num_lines, tail = divmod(len(X), step)
+    # Like textwrap, a short final group goes at the end of the previous line if it fits.
+    if tail and not (num_lines and tail < width and (step//width)*(width+1) + tail <= linewidth):
+        num_lines += 1
+    return num_lines
+
+
+def format_page(X, page, lines_per_page=20, width=5, linewidth=60):
+    '''Returns page number `page` (counting from 0) of add_spaces(X, width, linewidth),
+    with `lines_per_page` lines per page.  Only the letters on that page are formatted.'''
+    start = page * lines_per_page
+    return '\n'.join(iter_lines(X, width, linewidth, start=start, stop=start+lines_per_page))
+
+
+def shift_char(ch, shift_amt):
+    '''Shifts a specific character by shift_amt.
+    Example:
+    shift_char("Y", 3) returns "B"
+    '''
+    if ch in string.ascii_lowercase:
+        base = 'a'
+    elif ch in string.ascii_uppercase:
+        base = 'A'
+    # It's not clear what shifting should mean in other cases
+    # so if the character is not upper or lower-case, we leave it unchanged
+    else:
+        return ch
+    return chr((ord(ch)-ord(base)+shift_amt)%26+ord(base))
+
+
+@instrumented
+def shift_string(X, shift_amt):
+    '''Shifts all characters in X by the same amount.'''
+    shift_amt = int(shift_amt) % 26
+    if X.isascii():
+        return X.encode("ascii").translate(_BYTE_TABLES[shift_amt]).decode("ascii")
+    return X.translate(_TABLES[shift_amt])
+
+
+def all_shift_strings(X):
+    '''Returns the list of all 26 shifts of X, where entry s is shift_string(X, s).'''
+    return [shift_string(X, s) for s in range(26)]
+
+
+def weave(string_list):
+    output = ''.join([''.join(tup) for tup in zip(*string_list)])
+    # The rest is just to deal with the case of unequal string lengths
+    # We assume the only possibility is that the early strings are one character longer
+    last_length = len(string_list[-1])
+    extra = [s[-1] for s in string_list if len(s) > last_length]
+    return output + ''.join(extra)
+
+
+def factor_out_2(num):
+    '''Returns (k, q) such that num equals 2^k * q'''
+    if (not isinstance(num, int)) or (num <= 0):
+        raise ValueError("The input should be a positive integer.")
+    # num & -num keeps only the lowest set bit of num, which is 2^k.
+    k = (num & -num).bit_length() - 1
+    return (k, num >> k)
+
+
+@instrumented
+def count_substrings(X,n):
+    '''Returns a Python Counter object of all n-grams in X.'''
+    from .ngrams import count_substrings
+    return count_substrings(X, n)
+
+
+@instrumented
+def get_freq(X, case="lower"):
+    '''Returns the proportion that each letter occurs in "X"'''
+
+    if case == "lower":
+        letters = string.ascii_lowercase
+    elif case == "upper":
+        letters = string.ascii_uppercase
+    else:
+        raise ValueError("case should be 'upper' or 'lower'.")
+
+    X = only_letters(X, case=case)
+    n = len(X)
+    ctr = count_substrings(X, 1)
+    output = {}
+    for char in letters:
+        output[char] = ctr[char]/n
+    return output
+
+
+@instrumented
+def mut_ind_co(d1, d2):
+    '''For letter frequency dictionaries d1 and d2, return the Mutual Index of Coincidence.
+    See Equation (5.9) on page 222 in Hoffstein, Pipher, Silverman.
+    d1 and d2 can also be frequency vectors, or stacks of them, in which case the
+    result is an array with one score for each vector in the batch.'''
+    if isinstance(d1, dict) and isinstance(d2, dict):
+        s = 0
+        for k in d1.keys():
+            s += d1.get(k, 0)*d2.get(k,0)
+        return s
+    from .mic import mut_ind_co_vectors
+    return mut_ind_co_vectors(d1, d2)
+
+
+def ind_co(X):
+    '''Returns the index of coincidence of the letters in X, "without replacement".'''
+    from .keylength import ind_co
+    return ind_co(X)
+
+
+@instrumented
+def kasiski_diffs(Y, case="upper"):
+    '''Returns the sorted array of all distances between repeated trigrams in Y.'''
+    from .kasiski import kasiski_diffs
+    return kasiski_diffs(Y, case=case)
+
+
+@instrumented
+def freq_chart(X, case="upper"):
+    '''Plot the letter frequency chart.'''
+    from .charts import freq_chart
+    return freq_chart(X, case=case)
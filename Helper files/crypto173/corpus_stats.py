@@ -0,0 +1,139 @@
+'''Building n-gram frequency tables from large corpora.
+
+A corpus is split into byte ranges, and each range is counted in a separate process.
+Because letters are joined across spaces and punctuation (just like only_letters),
+an n-gram can start in one range and end in the next.  Each worker therefore counts
+exactly the n-grams that *start* in its range, reading as far past the end of the
+range as it needs to finish them.  The partial counts are dense arrays, so merging
+them is just addition.
+
+The tables are saved as .npy files whose names include TABLE_VERSION, and are loaded
+(memory-mapped) when this module is imported.
+
+To rebuild the shipped tables:
+    python -m crypto173.corpus_stats "Helper files/PridePrejudice.txt"
+'''
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .ngrams import ngram_codes
+from .normalize import to_codes
+
+TABLE_VERSION = 1
+MAX_N = 4
+TABLE_NAMES = {1: "unigram", 2: "bigram", 3: "trigram", 4: "quadgram"}
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Size of the byte range handed to each worker.
+CHUNK_BYTES = 1 << 24
+
+
+def table_path(n, directory=DATA_DIR, version=TABLE_VERSION):
+    '''Returns the path of the saved table of n-gram counts.'''
+    return os.path.join(directory, f"{TABLE_NAMES[n]}_v{version}.npy")
+
+
+def count_range(path, start, end, max_n=MAX_N):
+    '''Returns a list whose (n-1)st entry is the dense array of counts of the n-grams
+    that start at a letter in bytes [start, end) of the file at `path`.'''
+    with open(path, "rb") as f:
+        f.seek(start)
+        codes = to_codes(f.read(end - start))
+        # Read past the end of the range until we have the max_n - 1 letters
+        # needed to finish the n-grams that start near the end of the range.
+        tail = np.zeros(0, dtype=np.uint8)
+        while len(tail) < max_n - 1:
+            more = f.read(4096)
+            if not more:
+                break
+            tail = np.concatenate([tail, to_codes(more)])
+    size = len(codes)
+    codes = np.concatenate([codes, tail[:max_n-1]])
+    return [
+        np.bincount(ngram_codes(codes[:size+n-1], n), minlength=26**n)
+        for n in range(1, max_n+1)
+    ]
+
+
+def build_tables(paths, max_n=MAX_N, chunk_bytes=CHUNK_BYTES, workers=None):
+    '''Counts all n-grams, for n = 1, ..., max_n, in the text files `paths`.
+    Returns a dictionary mapping n to a dense array of counts of length 26**n.
+    The files are split into ranges of `chunk_bytes` bytes which are counted in a
+    pool of `workers` processes.  Use workers=1 to count in this process instead.
+    n-grams never span two different files.'''
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    tasks = []
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, size, chunk_bytes):
+            tasks.append((path, start, min(start + chunk_bytes, size), max_n))
+
+    totals = [np.zeros(26**n, dtype=np.int64) for n in range(1, max_n+1)]
+    if workers == 1:
+        results = (count_range(*task) for task in tasks)
+        _accumulate(totals, results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            _accumulate(totals, executor.map(count_range, *zip(*tasks)))
+    return {n: totals[n-1] for n in range(1, max_n+1)}
+
+
+def save_tables(tables, directory=DATA_DIR, version=TABLE_VERSION):
+    '''Saves the tables produced by build_tables as versioned .npy files.
+    Counts are stored as uint32 when they fit.'''
+    os.makedirs(directory, exist_ok=True)
+    for n, counts in tables.items():
+        if counts.max(initial=0) < 2**32:
+            counts = counts.astype(np.uint32)
+        np.save(table_path(n, directory, version), counts)
+
+
+def load_tables(directory=DATA_DIR, version=TABLE_VERSION):
+    '''Returns a dictionary mapping n to the saved table of n-gram counts.
+    The files are memory-mapped, so this takes milliseconds no matter how large they are.
+    Tables that have not been built are left out.'''
+    tables = {}
+    for n in TABLE_NAMES:
+        path = table_path(n, directory, version)
+        if os.path.exists(path):
+            tables[n] = np.load(path, mmap_mode="r")
+    return tables
+
+
+def ngram_freq(n):
+    '''Returns the proportion of all n-grams taken by each n-gram, indexed by n-gram code.'''
+    try:
+        counts = TABLES[n]
+    except KeyError:
+        raise ValueError(f"No table of {n}-gram counts has been built.") from None
+    return counts / counts.sum()
+
+
+def _accumulate(totals, results):
+    for partial in results:
+        for total, counts in zip(totals, partial):
+            total += counts
+
+
+TABLES = load_tables()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build n-gram frequency tables from text corpora.")
+    parser.add_argument("paths", nargs="+", help="text files to count")
+    parser.add_argument("--out", default=DATA_DIR, help="directory for the .npy tables")
+    parser.add_argument("--max-n", type=int, default=MAX_N, choices=sorted(TABLE_NAMES))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-bytes", type=int, default=CHUNK_BYTES)
+    args = parser.parse_args(argv)
+    tables = build_tables(args.paths, max_n=args.max_n, chunk_bytes=args.chunk_bytes, workers=args.workers)
+    save_tables(tables, directory=args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+'''A store of corpora, normalized once into letter codes on disk and memory-mapped.
+
+The first time a text file is opened, its letters are written to a .npy file of uint8
+letter codes (0-25), along with the positions (in letters) where each word and each
+sentence starts.  The text is read a chunk at a time, so building the store needs
+little memory beyond the arrays it saves.  The files are named after the size and
+modification time of the text, so an edited text is normalized again.  After that,
+opening the corpus memory-maps the files, which takes milliseconds; processes that
+open the same corpus share the same pages of memory, and taking an excerpt only
+touches the letters in it.
+
+    python -m crypto173.corpus_store "Helper files/PridePrejudice.txt"
+
+builds the store for some texts ahead of time.
+'''
+import argparse
+import functools
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from .memo import digest_cache
+from .normalize import CHUNK_SIZE, from_codes, _CODE_TABLE, _strip_bom
+
+STORE_VERSION = 2
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "corpora")
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "PridePrejudice.txt")
+
+_PARTS = ("letters", "words", "sentences")
+_SENTENCE_ENDS = np.frombuffer(b".!?", dtype=np.uint8)
+
+Corpus = namedtuple("Corpus", ["letters", "words", "sentences"])
+Corpus.__doc__ = '''A normalized corpus: `letters` is the array of letter codes, and `words`
+and `sentences` are sorted arrays of the positions in `letters` where each word and
+sentence starts.'''
+
+_rng = None
+_rng_pid = None
+_last_text = None
+
+
+def _byte_chunks(source, chunk_size):
+    '''Yields `source` (str, bytes or a binary file) as chunks of at most `chunk_size`
+    bytes, without a leading BOM.'''
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if hasattr(source, "read"):
+        chunks = iter(lambda: source.read(chunk_size), b"")
+    else:
+        view = memoryview(source)
+        chunks = (view[i:i+chunk_size] for i in range(0, len(view), chunk_size))
+    first = True
+    for chunk in chunks:
+        if first:
+            chunk = _strip_bom(chunk)
+            first = False
+        yield chunk
+
+
+def _normalized_chunks(source, chunk_size=CHUNK_SIZE):
+    '''Yields a Corpus for each chunk of `source` (str, bytes or a file opened in binary
+    mode), with the positions counted from the start of the whole text.  Only one chunk
+    is worked on at a time, so the temporary arrays stay small whatever the length of
+    the text.  A full stop after the last letter still gives a sentence start.'''
+    seen = 0
+    # The last two bytes of the previous chunk, whether its last byte can be inside a
+    # word, and the last sentence start yielded.
+    tail = b"\0\0"
+    after_word = False
+    last_sentence = -1
+    for chunk in _byte_chunks(source, chunk_size):
+        if not len(chunk):
+            continue
+        ext = np.frombuffer(tail + bytes(chunk), dtype=np.uint8)
+        raw = ext[2:]
+        codes = _CODE_TABLE[raw]
+        is_letter = codes != 255
+        # before[i] is the number of letters in the chunk before position i.
+        before = np.cumsum(is_letter, dtype=np.int32) - is_letter
+        # A word starts at a letter that does not follow a letter or an apostrophe
+        # (' or a right single quote, which is E2 80 99 in UTF-8).
+        quote = (raw == 0x99) & (ext[:-2] == 0xE2) & (ext[1:-1] == 0x80)
+        in_word = is_letter | (raw == ord("'")) | quote
+        word_starts = is_letter.copy()
+        word_starts[0] &= not after_word
+        word_starts[1:] &= ~in_word[:-1]
+        words = before[word_starts] + np.int64(seen)
+        # A sentence starts at the first letter after a full stop, question or exclamation mark.
+        sentences = before[np.isin(raw, _SENTENCE_ENDS)] + np.int64(seen)
+        if last_sentence < 0:
+            sentences = np.concatenate([[0], sentences])
+        sentences = np.unique(sentences)
+        sentences = sentences[sentences > last_sentence]
+        if len(sentences):
+            last_sentence = int(sentences[-1])
+        yield Corpus(codes[is_letter], words, sentences)
+        seen += int(is_letter.sum())
+        tail = bytes(ext[-2:])
+        after_word = bool(in_word[-1])
+
+
+def normalize_text(data, chunk_size=CHUNK_SIZE):
+    '''Returns a Corpus (with ordinary arrays) for the text `data`, given as str, bytes
+    or a file opened in binary mode.'''
+    parts = list(_normalized_chunks(data, chunk_size))
+    if not parts:
+        return Corpus(np.zeros(0, dtype=np.uint8), *[np.zeros(0, dtype=np.int64)] * 2)
+    letters, words, sentences = [np.concatenate(part) for part in zip(*parts)]
+    # A full stop after the last letter does not start a sentence.
+    return Corpus(letters, words, sentences[sentences < len(letters)])
+
+
+def store_paths(path, directory=STORE_DIR, version=STORE_VERSION):
+    '''Returns a dictionary with the paths of the store files for the text file `path`.
+    The names include the size and modification time of the file, so finding them
+    does not read it.'''
+    stat = os.stat(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    return {
+        part: os.path.join(directory, f"{name}_{stat.st_size}_{stat.st_mtime_ns}_{part}_v{version}.npy")
+        for part in _PARTS
+    }
+
+
+def build_store(path, directory=STORE_DIR):
+    '''Normalizes the text file `path` and saves its store files.  Returns their paths.'''
+    paths = store_paths(path, directory)
+    with open(path, "rb") as f:
+        corpus = normalize_text(f)
+    os.makedirs(directory, exist_ok=True)
+    for part in _PARTS:
+        # Write to a temporary file first, so that another process never opens half a file.
+        tmp = f"{paths[part]}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, getattr(corpus, part))
+        os.replace(tmp, paths[part])
+    return paths
+
+
+@functools.lru_cache(maxsize=16)
+def open_corpus(path=DEFAULT_CORPUS, directory=STORE_DIR):
+    '''Returns the Corpus for the text file `path`, with memory-mapped arrays, building
+    the store first if needed.'''
+    paths = store_paths(path, directory)
+    if not all(os.path.exists(p) for p in paths.values()):
+        build_store(path, directory)
+    return Corpus(*[np.load(paths[part], mmap_mode="r") for part in _PARTS])
+
+
+def corpus_from_text(text):
+    '''Returns the Corpus for the string `text`, remembering the last few texts.  If
+    `text` is the same object as last time, not even a hash of it is computed.'''
+    global _last_text
+    if _last_text is not None and _last_text[0] is text:
+        return _last_text[1]
+    corpus = _corpus_from_text(text)
+    _last_text = (text, corpus)
+    return corpus
+
+
+@digest_cache(max_entries=4)
+def _corpus_from_text(text):
+    return normalize_text(text)
+
+
+def excerpt(corpus, length, rng=None, align=None):
+    '''Returns the letter codes of a random excerpt of `length` letters from `corpus`.
+    With align="word" or align="sentence", the excerpt starts at the beginning of a
+    word or sentence.  Only the letters of the excerpt are read.'''
+    rng = shared_rng() if rng is None else rng
+    n = len(corpus.letters)
+    if length > n:
+        raise ValueError(f"The corpus only has {n} letters.")
+    if align is None:
+        start = int(rng.integers(0, n - length + 1))
+    else:
+        try:
+            starts = {"word": corpus.words, "sentence": corpus.sentences}[align]
+        except KeyError:
+            raise ValueError("align should be None, 'word' or 'sentence'.") from None
+        # The starts that leave room for `length` letters.
+        count = int(np.searchsorted(starts, n - length, side="right"))
+        if count == 0:
+            raise ValueError(f"No {align} starts {length} letters before the end.")
+        start = int(starts[rng.integers(0, count)])
+    return np.array(corpus.letters[start:start + length])
+
+
+def sample_excerpt(source=None, length=500, rng=None, align=None, case="upper"):
+    '''Returns a random excerpt of `length` letters as a string.  `source` is a Corpus
+    or the path of a text file (by default, PridePrejudice.txt).  For the text itself,
+    pass corpus_from_text(text).'''
+    if source is None:
+        corpus = open_corpus()
+    elif isinstance(source, (str, os.PathLike)):
+        corpus = open_corpus(os.fspath(source))
+    else:
+        corpus = source
+    return from_codes(excerpt(corpus, length, rng, align), case=case)
+
+
+def shared_rng():
+    '''Returns the random generator used when none is passed in.  It is made once per
+    process, instead of once per excerpt.  A forked worker makes its own, so it does not
+    repeat the excerpts of its parent.'''
+    global _rng, _rng_pid
+    if _rng is None or _rng_pid != os.getpid():
+        _rng = np.random.default_rng()
+        _rng_pid = os.getpid()
+    return _rng
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the corpus store for some text files.")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_CORPUS])
+    parser.add_argument("--directory", default=STORE_DIR)
+    args = parser.parse_args(argv)
+    for path in args.paths:
+        paths = build_store(path, args.directory)
+        corpus = open_corpus(path, args.directory)
+        print(f"{path}: {len(corpus.letters)} letters, {len(corpus.words)} words, "
+              f"{len(corpus.sentences)} sentences -> {os.path.dirname(paths['letters'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
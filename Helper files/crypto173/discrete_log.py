@@ -0,0 +1,187 @@
+'''Discrete logarithms modulo p: given g and h, find x with g^x = h (mod p).
+
+The Pohlig-Hellman algorithm uses the factorization of the order N of g: for each
+prime power q^e dividing N, the digits of x in base q are found one at a time by
+taking logs in the subgroup of order q, and the results are put back together with
+the Chinese Remainder Theorem.  Each of those logs is found by baby-step giant-step,
+in about sqrt(q) steps.
+
+The baby steps gamma^j (j < m) are stored in a BabyStepTable: a sorted NumPy array of
+their low 64 bits, next to the matching exponents, which takes 16 bytes per entry.
+The giant steps are looked up a chunk at a time with np.searchsorted.  A table only
+depends on gamma and p, so a DiscreteLogSolver builds one table per prime factor of N
+and reuses it for every h: a batch of logs in the same group pays for the baby steps
+only once.
+'''
+import math
+
+import numpy as np
+
+from .factorization import factor
+from .modular import crt
+
+# The largest number of baby steps stored in one table (16 bytes each).
+MAX_TABLE_ENTRIES = 1 << 22
+
+_LOW_64_BITS = (1 << 64) - 1
+
+
+class BabyStepTable:
+    '''The baby steps gamma^0, ..., gamma^(m-1) modulo p, for taking logs to the base
+    gamma, which has order `order`.  m is about sqrt(order), but at most
+    `max_entries`; a smaller table means more giant steps.'''
+
+    def __init__(self, gamma, p, order, max_entries=MAX_TABLE_ENTRIES):
+        self.gamma = gamma
+        self.p = p
+        self.order = order
+        self.m = max(1, min(math.isqrt(order - 1) + 1, max_entries))
+        values = np.empty(self.m, dtype=np.uint64)
+        value = 1
+        for j in range(self.m):
+            values[j] = value & _LOW_64_BITS
+            value = value * gamma % p
+        self.exponents = np.argsort(values, kind="stable")
+        self.keys = values[self.exponents]
+        # Multiplying by this takes one giant step.
+        self.giant = pow(gamma, -self.m, p)
+        self._powers = None
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.exponents.nbytes
+
+    def log(self, h, chunk=1024):
+        '''Returns x in [0, order) with gamma^x = h (mod p), or None if there is none.'''
+        h %= self.p
+        steps = -(-self.order // self.m)
+        y = h
+        for start in range(0, steps, chunk):
+            count = min(chunk, steps - start)
+            giants = self._giant_steps(y, count)
+            y = int(giants[-1]) * self.giant % self.p
+            keys = giants if isinstance(giants, np.ndarray) else np.array(
+                [v & _LOW_64_BITS for v in giants], dtype=np.uint64)
+            positions = np.searchsorted(self.keys, keys)
+            positions[positions == len(self.keys)] = 0
+            for i in np.flatnonzero(self.keys[positions] == keys):
+                x = self._match(int(giants[i]), int(positions[i]), start + int(i))
+                if x is not None:
+                    return x
+        return None
+
+    def _giant_steps(self, y, count):
+        '''Returns y times giant^i modulo p for i < count.  When p is below 2^32, the
+        products fit in 64 bits, and they are computed as one array operation.'''
+        if self.p < 1 << 32:
+            return np.uint64(y) * self._giant_powers(count) % np.uint64(self.p)
+        giants = []
+        for _ in range(count):
+            giants.append(y)
+            y = y * self.giant % self.p
+        return giants
+
+    def _giant_powers(self, count):
+        if self._powers is None or len(self._powers) < count:
+            powers = np.empty(count, dtype=np.uint64)
+            value = 1
+            for i in range(count):
+                powers[i] = value
+                value = value * self.giant % self.p
+            self._powers = powers
+        return self._powers[:count]
+
+    def _match(self, value, position, i):
+        '''Checks the baby steps whose low 64 bits match `value`, which is the i-th giant
+        step.  Only needed to rule out collisions when p is bigger than 2^64.'''
+        key = value & _LOW_64_BITS
+        while position < len(self.keys) and int(self.keys[position]) == key:
+            j = int(self.exponents[position])
+            if self.p <= _LOW_64_BITS or pow(self.gamma, j, self.p) == value:
+                return (i * self.m + j) % self.order
+            position += 1
+        return None
+
+
+def element_order(g, p, group_order):
+    '''Returns the order of g modulo p, where `group_order` is a multiple of it (such as
+    p - 1 for a prime p), given as an int or as a Factorization.  Returns
+    (order, factors), with factors the (prime, exponent) pairs of the order.'''
+    if isinstance(group_order, int):
+        group_order = factor(group_order)
+    if group_order.cofactor != 1:
+        raise ValueError("The group order could not be completely factored.")
+    order = math.prod(q**e for q, e in group_order.factors)
+    factors = []
+    for q, e in group_order.factors:
+        while e > 0 and pow(g, order // q, p) == 1:
+            order //= q
+            e -= 1
+        if e:
+            factors.append((q, e))
+    return order, factors
+
+
+class DiscreteLogSolver:
+    '''Takes discrete logs to the base g modulo p.  `group_order` is a multiple of the
+    order of g (by default p - 1, which is right when p is prime).  The baby-step tables
+    are built the first time they are needed and kept for later calls.'''
+
+    def __init__(self, g, p, group_order=None, max_table_entries=MAX_TABLE_ENTRIES):
+        self.g = g % p
+        self.p = p
+        self.order, self.factors = element_order(
+            self.g, p, p - 1 if group_order is None else group_order)
+        self.max_table_entries = max_table_entries
+        self._tables = {}
+
+    def table(self, q):
+        '''Returns the baby-step table for the subgroup of prime order q.'''
+        if q not in self._tables:
+            gamma = pow(self.g, self.order // q, self.p)
+            self._tables[q] = BabyStepTable(gamma, self.p, q, self.max_table_entries)
+        return self._tables[q]
+
+    def log(self, h):
+        '''Returns x in [0, order of g) with g^x = h (mod p).  Raises a ValueError if h is
+        not a power of g.'''
+        h %= self.p
+        residues, moduli = [], []
+        for q, e in self.factors:
+            residues.append(self._log_prime_power(h, q, e))
+            moduli.append(q**e)
+        x = crt(residues, moduli)[0]
+        if pow(self.g, x, self.p) != h:
+            raise ValueError(f"{h} is not a power of {self.g} modulo {self.p}.")
+        return x
+
+    def logs(self, hs):
+        '''Returns the list of logs of the entries of `hs`, sharing the tables.'''
+        return [self.log(h) for h in hs]
+
+    def _log_prime_power(self, h, q, e):
+        '''Returns x mod q^e, found one base-q digit at a time.'''
+        table = self.table(q)
+        # g^(-1), raised to the powers q^k as the digits are found.
+        g_inverse = pow(self.g, -1, self.p)
+        x = 0
+        for k in range(e):
+            # h * g^(-x) is in the subgroup of order q^(e-k); its power below has order q.
+            reduced = pow(h * pow(g_inverse, x, self.p), self.order // q**(k+1), self.p)
+            digit = table.log(reduced)
+            if digit is None:
+                raise ValueError(f"{h} is not a power of {self.g} modulo {self.p}.")
+            x += digit * q**k
+        return x
+
+
+def discrete_log(g, h, p, group_order=None, max_table_entries=MAX_TABLE_ENTRIES):
+    '''Returns x with g^x = h (mod p), the smallest such x that is not negative.
+    See DiscreteLogSolver.'''
+    return DiscreteLogSolver(g, p, group_order, max_table_entries).log(h)
+
+
+def discrete_log_batch(g, hs, p, group_order=None, max_table_entries=MAX_TABLE_ENTRIES):
+    '''Returns the list of discrete logs of the entries of `hs` to the base g modulo p,
+    building each baby-step table only once.'''
+    return DiscreteLogSolver(g, p, group_order, max_table_entries).logs(hs)
@@ -0,0 +1,234 @@
+'''Factoring integers: trial division, Pollard's rho and Pollard's p - 1.
+
+factor(n) removes the powers of 2 with factor_out_2, divides by the primes in a cached
+table, and then splits whatever is left with Pollard's p - 1 method (which is fast when
+some prime factor p has p - 1 built from small primes) and Pollard's rho method with
+Brent's cycle detection.  Both Pollard methods accumulate the differences they test in
+a running product, so only one gcd is taken every `batch` steps.
+
+If a time budget is given and runs out, the factorization stops, and the part of n
+that is still unfactored is returned as the cofactor, in the spirit of factor_out_2.
+'''
+import functools
+import math
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .core import factor_out_2
+from .primes import is_prime, small_primes
+
+# Trial division uses the primes below this.
+TRIAL_LIMIT = 1 << 16
+# The default smoothness bound for Pollard's p - 1 method inside factor.
+P_MINUS_1_BOUND = 100_000
+# Below this, factor goes straight to Pollard's rho method, which needs only about
+# n^(1/4) steps.
+RHO_ONLY_LIMIT = 1 << 48
+
+Factorization = namedtuple("Factorization", ["factors", "cofactor"])
+Factorization.__doc__ = '''The result of factor(n).  `factors` is a list of (prime, exponent)
+pairs in increasing order, and `cofactor` is the unfactored part of n (1 if the
+factorization is complete), so n equals cofactor times the product of p^e.'''
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+def _check(deadline):
+    if deadline is not None and time.perf_counter() > deadline:
+        raise _OutOfTime
+
+
+@functools.lru_cache(maxsize=4)
+def _prime_blocks(limit, size=128):
+    '''Returns the primes below `limit` in blocks of `size`, each with its product.'''
+    primes = small_primes(limit)
+    blocks = [primes[i:i+size] for i in range(0, len(primes), size)]
+    return tuple((block, math.prod(block)) for block in blocks)
+
+
+def trial_division(n, limit=TRIAL_LIMIT):
+    '''Divides n by the primes below `limit`.  Returns (factors, rest), where factors is
+    a list of (prime, exponent) pairs and rest has no prime factor below `limit`.'''
+    factors = []
+    for block, product in _prime_blocks(limit):
+        if block[0] * block[0] > n:
+            break
+        # One gcd tells us whether any prime in the block divides n.
+        if math.gcd(n, product) == 1:
+            continue
+        for p in block:
+            if n % p == 0:
+                e = 0
+                while n % p == 0:
+                    n //= p
+                    e += 1
+                factors.append((p, e))
+    if 1 < n < limit * limit:
+        # Every prime factor below the limit is gone, so n is 1 or a prime.
+        factors.append((n, 1))
+        n = 1
+    return factors, n
+
+
+def pollard_p_minus_1(n, bound=P_MINUS_1_BOUND, batch=64, deadline=None):
+    '''Looks for a factor of n with Pollard's p - 1 method: if n has a prime factor p
+    such that every prime power dividing p - 1 is at most `bound`, then
+    gcd(2^M - 1, n) is divisible by p, where M is the product of all prime powers up to
+    `bound`.  Returns a nontrivial factor of n, or None.'''
+    a = 2
+    product = 1
+    last_a = a
+    primes = small_primes(bound + 1)
+    for i, p in enumerate(primes):
+        q = p
+        while q * p <= bound:
+            q *= p
+        a = pow(a, q, n)
+        product = product * (a - 1) % n
+        if i % batch == batch - 1 or i == len(primes) - 1:
+            _check(deadline)
+            g = math.gcd(product, n)
+            if g == n:
+                # Too many primes at once: redo this batch one prime at a time.
+                return _p_minus_1_one_at_a_time(n, last_a, primes[i - i % batch:i + 1], bound)
+            if g > 1:
+                return g
+            last_a = a
+    return None
+
+
+def _p_minus_1_one_at_a_time(n, a, primes, bound):
+    for p in primes:
+        e = 1
+        while p ** (e + 1) <= bound:
+            e += 1
+        for _ in range(e):
+            a = pow(a, p, n)
+            g = math.gcd(a - 1, n)
+            if 1 < g < n:
+                return g
+            if g == n:
+                return None
+    return None
+
+
+def pollard_rho(n, rng=None, batch=128, max_steps=None, deadline=None):
+    '''Looks for a factor of the odd composite number n with Pollard's rho method,
+    using the map x -> x^2 + c and Brent's cycle detection.  Tries new values of c
+    until it succeeds, or until `max_steps` steps in total have been taken.  Returns a
+    nontrivial factor of n, or None.'''
+    if rng is None:
+        rng = random.Random(n)
+    steps = 0
+    while max_steps is None or steps < max_steps:
+        y, c = rng.randrange(1, n), rng.randrange(1, n)
+        g = r = product = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                saved_y = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    product = product * (x - y) % n
+                k += batch
+                steps += batch
+                g = math.gcd(product, n)
+                _check(deadline)
+            r *= 2
+        if g == n:
+            # The batch overshot: step through it again one gcd at a time.
+            y = saved_y
+            while True:
+                y = (y * y + c) % n
+                g = math.gcd(x - y, n)
+                if g > 1:
+                    break
+        if g != n:
+            return g
+    return None
+
+
+def _perfect_power(n, smallest_factor):
+    '''Returns (root, k) with n = root^k for a prime k, or (n, 1) if n is not a perfect
+    power.  Every prime factor of n is assumed to be at least `smallest_factor`, which
+    bounds the exponents that need to be tried.'''
+    max_k = int(math.log(n) / math.log(smallest_factor))
+    for k in small_primes(max_k + 1):
+        root = _integer_root(n, k)
+        if root ** k == n:
+            return root, k
+    return n, 1
+
+
+def _integer_root(n, k):
+    '''Returns the floor of the k-th root of n.'''
+    if k == 2:
+        return math.isqrt(n)
+    x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def factor(n, time_budget=None, p_minus_1_bound=P_MINUS_1_BOUND, trial_limit=TRIAL_LIMIT):
+    '''Factors the positive integer n.  Returns a Factorization (factors, cofactor).
+    If `time_budget` (in seconds) runs out first, the part of n that has not been
+    factored is returned as the cofactor.'''
+    if (not isinstance(n, int)) or (n <= 0):
+        raise ValueError("The input should be a positive integer.")
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    exponents = {}
+    k, n = factor_out_2(n)
+    if k:
+        exponents[2] = k
+    found, n = trial_division(n, trial_limit)
+    for p, e in found:
+        exponents[p] = exponents.get(p, 0) + e
+    cofactor = 1
+    # Each entry is (m, e): m^e is a part of n that still needs to be factored.
+    stack = [(n, 1)] if n > 1 else []
+    rng = random.Random(n)
+    while stack:
+        m, e = stack.pop()
+        if is_prime(m):
+            exponents[m] = exponents.get(m, 0) + e
+            continue
+        root, k = _perfect_power(m, trial_limit)
+        if k > 1:
+            stack.append((root, e * k))
+            continue
+        try:
+            d = None
+            if m >= RHO_ONLY_LIMIT:
+                d = pollard_p_minus_1(m, p_minus_1_bound, deadline=deadline)
+            if d is None:
+                d = pollard_rho(m, rng, deadline=deadline)
+        except _OutOfTime:
+            d = None
+        if d is None:
+            cofactor *= m ** e
+        else:
+            stack.append((d, e))
+            stack.append((m // d, e))
+    return Factorization(sorted(exponents.items()), cofactor)
+
+
+def factor_batch(numbers, workers=None, chunksize=8, **kwargs):
+    '''Factors every number in `numbers` in a pool of `workers` processes.  Keyword
+    arguments, such as a per-number `time_budget`, are passed on to factor.  Returns a
+    list of Factorization, in the same order as `numbers`.  Use workers=1 to factor
+    them in this process instead.'''
+    if workers == 1:
+        return [factor(n, **kwargs) for n in numbers]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        factor_one = functools.partial(factor, **kwargs)
+        return list(executor.map(factor_one, numbers, chunksize=chunksize))
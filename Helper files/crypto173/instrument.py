@@ -0,0 +1,184 @@
+'''Opt-in timing of the helper functions.
+
+The core helpers are wrapped with @instrumented.  While instrumentation is off (the
+default), the wrapper only checks one flag before calling the function.  Call enable(),
+or set the environment variable CRYPTO173_INSTRUMENT=1 before importing crypto173, to
+start recording, for each function:
+- the number of calls and their total time, with a histogram of call latencies;
+- the size of the data processed (len of a str or bytes first argument, or nbytes of
+  a NumPy array).
+Times include any instrumented helpers called inside (get_freq calls only_letters).
+
+stats() returns everything as a dictionary, and to_json() and to_prometheus() format
+it for export.  To see the calls made by one piece of code, wrap it in
+`with trace() as calls:`, or call start_trace() and stop_trace() around it (as the
+Week 1 app does for each rerun).  Only calls made in the current thread are collected,
+so other sessions do not get mixed in.  span(name) times any block
+of code in the same way as a helper call.
+'''
+import bisect
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+# Upper bounds (in seconds) of the latency histogram buckets.
+BUCKETS = tuple(float(f"{m}e{e}") for e in range(-6, 1) for m in ("1", "2.5", "5")) + (10.0,)
+
+_enabled = os.environ.get("CRYPTO173_INSTRUMENT", "") not in ("", "0")
+_lock = threading.Lock()
+_stats = {}
+_local = threading.local()
+
+
+def enable():
+    '''Starts recording calls to the instrumented helpers.'''
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    '''Stops recording.  The statistics collected so far are kept.'''
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    '''Forgets all the statistics collected so far.'''
+    with _lock:
+        _stats.clear()
+
+
+def _input_size(args):
+    if not args:
+        return 0
+    X = args[0]
+    if isinstance(X, (str, bytes, bytearray)):
+        return len(X)
+    return getattr(X, "nbytes", 0)
+
+
+def _record(name, seconds, nbytes):
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = {
+                "calls": 0, "seconds": 0.0, "bytes": 0, "buckets": [0] * (len(BUCKETS) + 1),
+            }
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        entry["bytes"] += nbytes
+        entry["buckets"][bisect.bisect_left(BUCKETS, seconds)] += 1
+    calls = getattr(_local, "calls", None)
+    if calls is not None:
+        calls.append((name, seconds, nbytes))
+
+
+def instrumented(func):
+    '''Decorator that records the calls to `func` while instrumentation is enabled.'''
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter() - start, _input_size(args))
+
+    return wrapper
+
+
+@contextlib.contextmanager
+def span(name, nbytes=0):
+    '''Times the code in a `with span(name):` block, if instrumentation is enabled.'''
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start, nbytes)
+
+
+def start_trace():
+    '''Starts collecting the calls recorded in this thread.  Returns the list they are
+    appended to, as (name, seconds, bytes) in the order the calls finished.'''
+    _local.calls = []
+    return _local.calls
+
+
+def stop_trace():
+    '''Stops collecting calls in this thread and returns the list of them.'''
+    calls = getattr(_local, "calls", None)
+    _local.calls = None
+    return calls or []
+
+
+@contextlib.contextmanager
+def trace():
+    '''Collects the calls recorded in this thread during a `with trace() as calls:`
+    block.  See start_trace.'''
+    try:
+        yield start_trace()
+    finally:
+        stop_trace()
+
+
+def summarize(calls):
+    '''Totals a list of calls from trace() by name.  Returns a list of
+    (name, calls, seconds, bytes), slowest first.'''
+    totals = {}
+    for name, seconds, nbytes in calls:
+        count, total, size = totals.get(name, (0, 0.0, 0))
+        totals[name] = (count + 1, total + seconds, size + nbytes)
+    rows = [(name,) + values for name, values in totals.items()]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def stats():
+    '''Returns a dictionary mapping each function name to its calls, total seconds,
+    bytes processed and latency histogram (the number of calls in each bucket, the
+    last one for calls slower than BUCKETS[-1]).'''
+    with _lock:
+        return {
+            name: dict(entry, buckets=list(entry["buckets"]))
+            for name, entry in sorted(_stats.items())
+        }
+
+
+def to_json(**kwargs):
+    '''Returns stats() as a JSON string, with the bucket bounds included.'''
+    return json.dumps({"buckets": list(BUCKETS), "functions": stats()}, **kwargs)
+
+
+def to_prometheus(prefix="crypto173"):
+    '''Returns stats() in the Prometheus text exposition format.'''
+    lines = [
+        f"# HELP {prefix}_call_seconds Latency of calls to the crypto173 helpers.",
+        f"# TYPE {prefix}_call_seconds histogram",
+    ]
+    current = stats()
+    for name, entry in current.items():
+        label = f'function="{name}"'
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), entry["buckets"]):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{prefix}_call_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+        lines.append(f"{prefix}_call_seconds_sum{{{label}}} {entry['seconds']!r}")
+        lines.append(f"{prefix}_call_seconds_count{{{label}}} {entry['calls']}")
+    lines.append(f"# HELP {prefix}_bytes_processed_total Size of the inputs to the helpers.")
+    lines.append(f"# TYPE {prefix}_bytes_processed_total counter")
+    for name, entry in current.items():
+        lines.append(f'{prefix}_bytes_processed_total{{function="{name}"}} {entry["bytes"]}')
+    return "\n".join(lines) + "\n"
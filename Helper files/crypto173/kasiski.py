@@ -0,0 +1,118 @@
+'''Kasiski examination without building every pairwise distance.
+
+All repeated n-grams are indexed in one pass: the n-gram codes are sorted (stably), so
+the positions of each repeated n-gram form one contiguous, increasing run.  Pairs of
+positions within a run are then numbered 0, 1, 2, ..., so they can be enumerated in
+fixed-size blocks (exact mode) or drawn at random (sampled mode), and each block of
+spacings is folded into a histogram of divisors as soon as it is produced.
+'''
+import numpy as np
+
+from .ngrams import case_sensitive_codes, ngram_codes
+from .normalize import to_codes
+
+# Number of spacings processed at a time, and the default cap on sampled pairs.
+BLOCK_SIZE = 1 << 18
+MAX_PAIRS = 1 << 20
+
+
+def repeat_index(codes, n=3, base=26):
+    '''Indexes the n-grams of `codes` that occur more than once.
+    Returns (positions, starts, sizes): `positions` holds the start of every repeated
+    n-gram occurrence, grouped by n-gram and increasing within each group, and group g
+    is positions[starts[g]:starts[g]+sizes[g]].'''
+    if n < 3:
+        raise ValueError("Use n >= 3 for the Kasiski examination.")
+    grams = ngram_codes(codes, n, base=base)
+    order = np.argsort(grams, kind="stable")
+    grams = grams[order]
+    new_group = np.r_[True, grams[1:] != grams[:-1]]
+    starts = np.flatnonzero(new_group)
+    sizes = np.diff(np.r_[starts, len(grams)])
+    repeated = sizes > 1
+    starts, sizes = starts[repeated], sizes[repeated]
+    keep = np.repeat(starts, sizes) + _ranges(sizes)
+    positions = order[keep]
+    return positions, np.cumsum(np.r_[0, sizes[:-1]]), sizes
+
+
+def iter_spacings(positions, starts, sizes, max_pairs=MAX_PAIRS, rng=None, block_size=BLOCK_SIZE):
+    '''Yields arrays of spacings between two occurrences of the same n-gram.
+    If there are at most `max_pairs` pairs (or max_pairs is None), every pair is used
+    once.  Otherwise `max_pairs` pairs are drawn uniformly at random, with replacement.
+    At most `block_size` spacings are held at a time.'''
+    pairs = sizes * (sizes - 1) // 2
+    ends = np.cumsum(pairs)
+    total = int(ends[-1]) if len(ends) else 0
+    if max_pairs is None or total <= max_pairs:
+        for lo in range(0, total, block_size):
+            yield _spacings(np.arange(lo, min(lo + block_size, total)), positions, starts, pairs, ends)
+    else:
+        rng = np.random.default_rng(rng)
+        for lo in range(0, max_pairs, block_size):
+            k = np.sort(rng.integers(0, total, min(block_size, max_pairs - lo)))
+            yield _spacings(k, positions, starts, pairs, ends)
+
+
+def divisor_counts(spacings, max_len=40):
+    '''Returns (counts, total), where counts[L] is the number of spacings divisible by L
+    (for 1 <= L <= max_len) and total is the number of spacings.
+    `spacings` is an array, or an iterable of arrays as produced by iter_spacings.'''
+    if isinstance(spacings, np.ndarray):
+        spacings = [spacings]
+    counts = np.zeros(max_len + 1, dtype=np.int64)
+    total = 0
+    lengths = np.arange(1, max_len + 1)
+    for block in spacings:
+        total += len(block)
+        for L in lengths:
+            counts[L] += np.count_nonzero(block % L == 0)
+    return counts, total
+
+
+def kasiski_key_lengths(Y, n=3, max_len=40, max_pairs=MAX_PAIRS, rng=None):
+    '''Returns candidate key lengths for the Vigenère ciphertext Y, best first, as a
+    list of (length, score) pairs.  The score of L is the fraction of spacings between
+    repeated n-grams that are divisible by L, minus the fraction 1/L expected by chance,
+    so multiples of the true key length score lower than the key length itself.
+    Y can be a string or an array of letter codes.  Use max_pairs=None for exact mode.'''
+    codes = to_codes(Y) if isinstance(Y, (str, bytes)) else np.asarray(Y)
+    index = repeat_index(codes, n)
+    counts, total = divisor_counts(iter_spacings(*index, max_pairs=max_pairs, rng=rng), max_len)
+    if total == 0:
+        return []
+    lengths = np.arange(2, max_len + 1)
+    scores = counts[2:] / total - 1 / lengths
+    order = np.argsort(-scores, kind="stable")
+    return list(zip(lengths[order].tolist(), scores[order].tolist()))
+
+
+def kasiski_diffs(Y, case="upper"):
+    '''Returns the sorted array of all distances between repeated trigrams in Y.'''
+    if not Y:
+        return np.array([])
+    codes, base, _ = case_sensitive_codes(Y if case is None else Y.upper())
+    blocks = list(iter_spacings(*repeat_index(codes, 3, base=base), max_pairs=None))
+    if not blocks:
+        return np.array([])
+    return np.sort(np.concatenate(blocks))
+
+
+def _ranges(sizes):
+    '''Returns the concatenation of arange(size) for each size in sizes.'''
+    offsets = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return np.arange(sizes.sum()) - offsets
+
+
+def _spacings(k, positions, starts, pairs, ends):
+    '''Returns the spacing of each pair numbered k.  Within a group, pair number r is
+    the pair (i, j) with i < j and r = j*(j-1)/2 + i.'''
+    group = np.searchsorted(ends, k, side="right")
+    r = k - (ends[group] - pairs[group])
+    j = ((1 + np.sqrt(8 * r + 1)) // 2).astype(np.int64)
+    # Guard against rounding in the square root.
+    j -= j * (j - 1) // 2 > r
+    j += (j + 1) * j // 2 <= r
+    i = r - j * (j - 1) // 2
+    first = starts[group]
+    return positions[first + j] - positions[first + i]
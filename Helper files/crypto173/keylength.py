@@ -0,0 +1,83 @@
+'''Estimating the key length of a Vigenère cipher with the index of coincidence.
+
+For a candidate period P the ciphertext is split into P columns (every P-th letter),
+and the index of coincidence of each column is computed exactly, "without replacement":
+    IC = sum_k f_k (f_k - 1) / (n (n - 1)),
+where f_k is the number of times letter k occurs in a column of n letters.  When P is
+a multiple of the key length, every column is a shift cipher, so its IC is close to
+English (about 0.066); otherwise it is closer to random text (about 0.038).
+
+The ciphertext is normalized once.  For each period, the counts of all P columns come
+from a single np.bincount over a (rows x P) view of the codes.  Each period still reads
+every letter once, so periodic_ic costs O(n * max_period) for n letters: about 0.2
+seconds for 100,000 letters and periods up to 300.
+'''
+import numpy as np
+
+from .normalize import to_codes
+
+# Index of coincidence of English and of uniformly random letters.
+ENGLISH_IC = 0.0656
+RANDOM_IC = 1 / 26
+
+
+def ind_co(X):
+    '''Returns the index of coincidence of the letters in X, "without replacement".'''
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else np.asarray(X)
+    f = np.bincount(codes, minlength=26)
+    n = len(codes)
+    return (1/(n*(n-1)))*int((f*(f-1)).sum())
+
+
+def periodic_ic(X, max_period=40):
+    '''Returns an array `ic` of length max_period + 1, where ic[P] is the average index
+    of coincidence of the P columns of X (ic[0] is nan).  Columns with fewer than two
+    letters are left out of the average; if there are none, ic[P] is nan.
+    X can be a string or an array of letter codes.  The time taken grows like
+    len(X) * max_period.'''
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else np.asarray(X, dtype=np.uint8)
+    n = len(codes)
+    ic = np.full(max_period + 1, np.nan)
+    # Letter codes, and letter codes offset by 26 times the column, for a full row.
+    offsets = (np.arange(max_period, dtype=np.int32) * 26)
+    for P in range(1, max_period + 1):
+        rows, extra = divmod(n, P)
+        # The first `extra` columns have one more letter than the others.
+        grid = codes[:rows*P].reshape(rows, P) + offsets[:P]
+        keys = np.concatenate([grid.ravel(), codes[rows*P:] + offsets[:extra]])
+        counts = np.bincount(keys, minlength=26*P).reshape(P, 26).astype(np.int64)
+        sizes = np.full(P, rows, dtype=np.int64)
+        sizes[:extra] += 1
+        valid = sizes > 1
+        if valid.any():
+            pairs = (counts * (counts - 1)).sum(axis=1)
+            ic[P] = np.mean(pairs[valid] / (sizes[valid] * (sizes[valid] - 1)))
+    return ic
+
+
+def ic_key_lengths(X, max_period=40):
+    '''Returns the candidate key lengths 1, ..., max_period for the Vigenère ciphertext
+    X as a list of (period, average column IC) pairs, highest IC first.
+    Multiples of the key length score about as well as the key length itself;
+    see estimate_key_length for picking one.'''
+    ic = periodic_ic(X, max_period)[1:]
+    periods = np.arange(1, max_period + 1)
+    order = np.argsort(-np.nan_to_num(ic, nan=-1), kind="stable")
+    return list(zip(periods[order].tolist(), ic[order].tolist()))
+
+
+def estimate_key_length(X, max_period=40, cutoff=None):
+    '''Returns the smallest period whose average column IC is at least `cutoff`, which
+    by default is 60% of the way from RANDOM_IC to ENGLISH_IC.  This avoids choosing a
+    multiple of the key length, and long periods whose short columns give noisy ICs.
+    If no period reaches the cutoff, the period with the highest IC is returned.
+    Raises a ValueError if X has fewer than two letters.'''
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else np.asarray(X, dtype=np.uint8)
+    if len(codes) < 2:
+        raise ValueError("X needs at least two letters to estimate a key length.")
+    if cutoff is None:
+        cutoff = RANDOM_IC + 0.6 * (ENGLISH_IC - RANDOM_IC)
+    # ic[0] is a placeholder, so leave it out.
+    ic = np.nan_to_num(periodic_ic(codes, max_period), nan=0)[1:]
+    above = np.flatnonzero(ic >= cutoff)
+    return int(above[0]) + 1 if len(above) else int(ic.argmax()) + 1
@@ -0,0 +1,56 @@
+'''A small, thread-safe cache for results computed from long texts.
+
+Results are keyed by a SHA-256 digest of the text, so the cache never holds on to the
+text itself as a key, and only the most recently used `max_entries` results are kept.
+This is meant for apps where many sessions ask about the same few texts over and over.
+'''
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def text_digest(text):
+    '''Returns a hex SHA-256 digest of a str or bytes object.'''
+    if isinstance(text, str):
+        text = text.encode("utf-8", "surrogatepass")
+    return hashlib.sha256(text).hexdigest()
+
+
+class DigestCache:
+    '''Wraps a function of one text argument, remembering its results for the
+    `max_entries` most recently used texts.'''
+
+    def __init__(self, func, max_entries=32):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, text):
+        key = text_digest(text)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        # Compute outside the lock, so one slow text does not hold up other sessions.
+        value = self.func(text)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def digest_cache(max_entries=32):
+    '''Decorator version of DigestCache.'''
+    return functools.partial(DigestCache, max_entries=max_entries)
@@ -0,0 +1,55 @@
+'''Mutual Index of Coincidence for one or many frequency vectors at once.
+
+See Section 5.2 of Hoffstein, Pipher, Silverman.  A frequency vector is an array whose
+last axis has length 26 (entry k is the proportion of the letter with code k), and any
+leading axes are treated as a batch.
+'''
+import string
+
+import numpy as np
+
+from .normalize import to_codes
+
+# _ROLL[j, s] is the letter code j shifted by s.
+_ROLL = (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26
+
+
+def freq_vector(X):
+    '''Returns the proportion that each letter occurs in X as an array of length 26.
+    X can be a string or an array of letter codes.  Case is ignored.'''
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else np.asarray(X)
+    if len(codes) == 0:
+        raise ValueError("X does not contain any letters.")
+    return np.bincount(codes, minlength=26) / len(codes)
+
+
+def as_freq_vector(d):
+    '''Converts a letter frequency dictionary (with upper or lower-case keys) into an
+    array of length 26.  Arrays are returned unchanged.'''
+    if not isinstance(d, dict):
+        d = np.asarray(d, dtype=float)
+        if d.ndim == 0 or d.shape[-1] != 26:
+            raise ValueError("A frequency vector should have 26 entries.")
+        return d
+    letters = zip(string.ascii_lowercase, string.ascii_uppercase)
+    return np.array([d.get(a, d.get(A, 0)) for a, A in letters], dtype=float)
+
+
+def mut_ind_co_vectors(d1, d2):
+    '''Returns the Mutual Index of Coincidence of frequency vectors (or dictionaries) d1
+    and d2.  If either is a stack of vectors, the result has one score for each.'''
+    return np.sum(as_freq_vector(d1) * as_freq_vector(d2), axis=-1)
+
+
+def mut_ind_co_shifts(freqs, ref):
+    '''Returns the Mutual Index of Coincidence between `ref` and `freqs` shifted by
+    s, for every shift s = 0, 1, ..., 25, as the last axis of the result.
+    `freqs` can be a single frequency vector (or dictionary) or a stack of them, of
+    shape (..., 26); `ref` is a single frequency vector, usually for English.
+    The shift s entry is the score of the text obtained by shifting by s, so the
+    score for a shift amount of -3, say, is at index -3 % 26.'''
+    freqs = as_freq_vector(freqs)
+    ref = as_freq_vector(ref)
+    # Entry (j, s) is ref at the letter j is sent to by a shift of s.
+    circulant = ref[_ROLL]
+    return freqs @ circulant
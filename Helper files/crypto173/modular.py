@@ -0,0 +1,170 @@
+'''Modular arithmetic: exponentiation, inverses, the extended Euclidean algorithm and
+the Chinese Remainder Theorem, for one number at a time or for whole arrays.
+
+The array versions accept anything NumPy can broadcast together.  When every modulus
+is a word-size integer (below WORD_MODULUS_LIMIT, so that a product of two residues
+fits in an unsigned 64-bit word), the work is done with vectorized NumPy arithmetic.
+Otherwise the entries are handed one at a time to the exact Python-int versions, and
+the result is an array of Python ints.
+'''
+import math
+
+import numpy as np
+
+WORD_MODULUS_LIMIT = 1 << 32
+
+
+def egcd(a, b):
+    '''Returns (g, x, y) with g = gcd(a, b) and a*x + b*y = g.'''
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q*x1
+        y0, y1 = y1, y0 - q*y1
+    if a < 0:
+        return (-a, -x0, -y0)
+    return (a, x0, y0)
+
+
+def mod_inverse(a, m):
+    '''Returns the inverse of a modulo m.  Raises a ValueError if there is none.'''
+    return pow(a, -1, m)
+
+
+def crt(residues, moduli):
+    '''Returns (x, M) where M is the least common multiple of `moduli` and x is the
+    unique number in [0, M) with x = residues[i] (mod moduli[i]) for each i.  The
+    moduli do not need to be pairwise coprime; if the congruences are inconsistent, a
+    ValueError is raised.'''
+    x, M = 0, 1
+    for r, m in zip(residues, moduli):
+        g, p, _ = egcd(M, m)
+        if (r - x) % g:
+            raise ValueError(f"x = {x} (mod {M}) and x = {r} (mod {m}) have no common solution.")
+        lcm = M // g * m
+        x = (x + M * ((r - x) // g * p % (m // g))) % lcm
+        M = lcm
+    return (x, M)
+
+
+def _is_word_size(moduli, *others):
+    '''Returns True if every array is an integer array and every modulus is positive
+    and below WORD_MODULUS_LIMIT.'''
+    if any(a.dtype.kind not in "iu" for a in (moduli,) + others):
+        return False
+    return moduli.size == 0 or (moduli.min() > 0 and moduli.max() < WORD_MODULUS_LIMIT)
+
+
+def _reduce(a, m):
+    '''Returns a mod m as an int64 array, for an integer array `a` and an int64 array
+    `m` of word-size moduli.  A uint64 array is reduced as uint64: mixing it with int64
+    would give float64 and lose precision.'''
+    if a.dtype == np.uint64:
+        return (a % m.astype(np.uint64)).astype(np.int64)
+    return np.mod(a.astype(np.int64), m)
+
+
+def _objects(*arrays):
+    '''Returns the arrays as arrays of Python ints, for the frompyfunc fallbacks.'''
+    return [a.astype(object) for a in arrays]
+
+
+def mod_pow_array(bases, exponents, moduli):
+    '''Returns an array with pow(bases[i], exponents[i], moduli[i]) in entry i.
+    Negative exponents use the modular inverse, as pow does.'''
+    bases, exponents, moduli = np.broadcast_arrays(
+        np.asarray(bases), np.asarray(exponents), np.asarray(moduli))
+    # uint64 exponents from 2^63 up do not fit in an int64.
+    huge = exponents.dtype == np.uint64 and exponents.size and exponents.max() >= 1 << 63
+    if huge or not _is_word_size(moduli, bases, exponents):
+        return np.frompyfunc(pow, 3, 1)(*_objects(bases, exponents, moduli))
+    m = moduli.astype(np.int64)
+    b = _reduce(bases, m)
+    e = exponents.astype(np.int64)
+    negative = e < 0
+    if negative.any():
+        b[negative] = mod_inverse_array(b[negative], m[negative])
+        e = np.abs(e)
+    m, b = m.astype(np.uint64), b.astype(np.uint64)
+    # Square and multiply, one bit of every exponent at a time.
+    result = np.ones_like(m) % m
+    while e.any():
+        result = np.where(e & 1, result * b % m, result)
+        b = b * b % m
+        e >>= 1
+    return result.astype(np.int64)
+
+
+def egcd_array(a, b):
+    '''Returns arrays (g, x, y) with g = gcd(a, b) and a*x + b*y = g, entry by entry.'''
+    a, b = np.broadcast_arrays(np.asarray(a), np.asarray(b))
+    if not (a.dtype.kind in "iu" and b.dtype.kind in "iu") or _too_big(a) or _too_big(b):
+        return np.frompyfunc(egcd, 2, 3)(a, b)
+    a = a.astype(np.int64)
+    b = b.astype(np.int64)
+    x0, x1 = np.ones_like(a), np.zeros_like(a)
+    y0, y1 = np.zeros_like(a), np.ones_like(a)
+    active = b != 0
+    while active.any():
+        q = a // np.where(active, b, 1)
+        a, b = np.where(active, b, a), np.where(active, a - q*b, b)
+        x0, x1 = np.where(active, x1, x0), np.where(active, x0 - q*x1, x1)
+        y0, y1 = np.where(active, y1, y0), np.where(active, y0 - q*y1, y1)
+        active = b != 0
+    sign = np.where(a < 0, -1, 1)
+    return (a * sign, x0 * sign, y0 * sign)
+
+
+def _too_big(a):
+    '''Returns True if the products formed by egcd_array could overflow int64.'''
+    return a.size > 0 and int(np.abs(a).max()) >= 1 << 62
+
+
+def mod_inverse_array(a, m):
+    '''Returns an array with the inverse of a[i] modulo m[i] in entry i.  Raises a
+    ValueError if any entry has no inverse.'''
+    a, m = np.broadcast_arrays(np.asarray(a), np.asarray(m))
+    if not _is_word_size(m, a):
+        return np.frompyfunc(mod_inverse, 2, 1)(*_objects(a, m))
+    m = m.astype(np.int64)
+    g, x, _ = egcd_array(_reduce(a, m), m)
+    bad = np.flatnonzero((g != 1) & (m != 1))
+    if len(bad):
+        i = bad[0]
+        raise ValueError(f"{a.flat[i]} is not invertible modulo {m.flat[i]}.")
+    return np.mod(x, m)
+
+
+def crt_array(residues, moduli):
+    '''Solves one system of congruences per row: returns arrays (x, M) where M[i] is the
+    least common multiple of moduli[i] and x[i] is the solution in [0, M[i]) of
+    x = residues[i, j] (mod moduli[i, j]) for every j.  Raises a ValueError if a system
+    is inconsistent.'''
+    residues, moduli = np.broadcast_arrays(np.atleast_2d(residues), np.atleast_2d(moduli))
+    word_size = _is_word_size(moduli, residues) and all(
+        math.prod(row) < 1 << 62 for row in moduli.tolist())
+    if not word_size:
+        pairs = [crt(r, m) for r, m in zip(residues.tolist(), moduli.tolist())]
+        x = np.array([pair[0] for pair in pairs], dtype=object)
+        M = np.array([pair[1] for pair in pairs], dtype=object)
+        return (x, M)
+    x = np.zeros(len(residues), dtype=np.int64)
+    M = np.ones(len(residues), dtype=np.int64)
+    for r, m in zip(residues.T, moduli.T.astype(np.int64)):
+        r = _reduce(r, m)
+        g, p, _ = egcd_array(M, m)
+        diff = r - x
+        bad = np.flatnonzero(diff % g)
+        if len(bad):
+            i = bad[0]
+            raise ValueError(f"The congruences in row {i} have no common solution.")
+        step = (m // g).astype(np.uint64)
+        # Both factors are below step < 2^32, so their product fits in a uint64.
+        t = (np.mod(diff // g, step).astype(np.uint64) * np.mod(p, step).astype(np.uint64)
+             % step).astype(np.int64)
+        step = step.astype(np.int64)
+        lcm = M * step
+        x = np.mod(x + M * t, lcm)
+        M = lcm
+    return (x, M)
@@ -0,0 +1,129 @@
+'''Counting n-grams using integer codes.
+
+An n-gram of letter codes c_0, c_1, ..., c_{n-1} is encoded as the integer
+c_0*26^(n-1) + c_1*26^(n-2) + ... + c_{n-1}, so "AAA" is 0 and "ZZZ" is 26^3 - 1.
+When there are at most DENSE_LIMIT possible codes (n <= 5 for 26 letters), and the
+text is not much shorter than that, they are counted with np.bincount into a dense
+array.  Otherwise only the n-grams that actually occur are counted, using np.unique.
+'''
+import string
+from collections import Counter
+
+import numpy as np
+
+from .core import letter_bytes
+from .normalize import to_codes
+
+# Largest number of bins for which we count with a dense np.bincount array.
+DENSE_LIMIT = 26**5
+
+# Largest n for which n-gram codes over a 52-letter alphabet still fit in an int64.
+_MAX_INT_N = {26: 13, 52: 11}
+
+# Maps a letter byte to its index in string.ascii_uppercase + string.ascii_lowercase.
+_MIXED_TABLE = np.zeros(256, dtype=np.uint8)
+_MIXED_TABLE[np.frombuffer(string.ascii_letters.encode("ascii"), dtype=np.uint8)] = (
+    np.r_[np.arange(26, 52), np.arange(26)]
+)
+_MIXED_ALPHABET = (string.ascii_uppercase + string.ascii_lowercase).encode("ascii")
+
+
+def ngram_codes(codes, n, base=26):
+    '''Returns an int64 array with the code of every n-gram in the array `codes`.
+    The codes are computed with a rolling sum, so no n-gram strings are ever built.'''
+    codes = np.asarray(codes)
+    m = len(codes) - n + 1
+    if m <= 0:
+        return np.zeros(0, dtype=np.int64)
+    grams = codes[:m].astype(np.int64)
+    for i in range(1, n):
+        grams *= base
+        grams += codes[i:i+m]
+    return grams
+
+
+def ngram_counts(X, n):
+    '''Returns a dense array of length 26**n, whose entry at the code of an n-gram is
+    the number of times that n-gram occurs in X (ignoring case).
+    X can be a string or an array of letter codes.'''
+    if 26**n > DENSE_LIMIT:
+        raise ValueError("Dense counts are only available for n <= 5; use sparse_ngram_counts.")
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else X
+    return np.bincount(ngram_codes(codes, n), minlength=26**n)
+
+
+def sparse_ngram_counts(X, n):
+    '''Returns (grams, counts), where grams is a sorted array of the codes of the
+    n-grams that occur in X (ignoring case), and counts holds how often each occurs.
+    For n > 13 the n-grams are returned as rows of letter codes instead of integers.'''
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else np.asarray(X, dtype=np.uint8)
+    return _count(codes, n, 26)
+
+
+def ngram_counter(X, n, case="upper"):
+    '''Returns a Counter of all n-grams in X, with the letters converted to `case`.'''
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else np.asarray(X, dtype=np.uint8)
+    grams, counts = _count(codes, n, 26)
+    return Counter(dict(zip(ngram_strings(grams, n, case), counts.tolist())))
+
+
+def ngram_strings(grams, n, case="upper"):
+    '''Converts an array of n-gram codes (or rows of letter codes) into a list of strings.'''
+    if case == "upper":
+        alphabet = string.ascii_uppercase.encode("ascii")
+    elif case == "lower":
+        alphabet = string.ascii_lowercase.encode("ascii")
+    else:
+        raise ValueError("case should be 'upper' or 'lower'.")
+    return _decode(np.asarray(grams), n, 26, alphabet)
+
+
+def count_substrings(X,n):
+    '''Returns a Python Counter object of all n-grams in X.'''
+    if not X:
+        return {}
+    codes, base, alphabet = case_sensitive_codes(X)
+    grams, counts = _count(codes, n, base)
+    return Counter(dict(zip(_decode(grams, n, base, alphabet), counts.tolist())))
+
+
+def case_sensitive_codes(X):
+    '''Returns (codes, base, alphabet) for the letters of X, keeping case apart.
+    If the letters of X are all upper-case or all lower-case, the codes are the usual
+    letter codes and base is 26; otherwise, upper and lower-case letters get different
+    codes, base is 52, and `alphabet` is the bytes object of letters in code order.'''
+    X = letter_bytes(X)
+    if X.isupper():
+        return to_codes(X), 26, string.ascii_uppercase.encode("ascii")
+    elif X.islower():
+        return to_codes(X), 26, string.ascii_lowercase.encode("ascii")
+    return _MIXED_TABLE[np.frombuffer(X, dtype=np.uint8)], 52, _MIXED_ALPHABET
+
+
+def _count(codes, n, base):
+    '''Returns the distinct n-grams of `codes` and their counts.'''
+    if n > _MAX_INT_N[base]:
+        if len(codes) < n:
+            return np.zeros((0, n), dtype=np.uint8), np.zeros(0, dtype=np.int64)
+        windows = np.lib.stride_tricks.sliding_window_view(codes, n)
+        return np.unique(windows, axis=0, return_counts=True)
+    grams = ngram_codes(codes, n, base=base)
+    # A dense array much longer than the text costs more to scan than sorting the text.
+    if base**n <= min(DENSE_LIMIT, 16 * len(grams) + 26**3):
+        counts = np.bincount(grams, minlength=base**n)
+        present = np.flatnonzero(counts)
+        return present, counts[present]
+    return np.unique(grams, return_counts=True)
+
+
+def _decode(grams, n, base, alphabet):
+    '''Converts n-gram codes (or rows of letter codes) back into strings.'''
+    if grams.ndim == 1:
+        digits = np.empty((len(grams), n), dtype=np.uint8)
+        grams = grams.copy()
+        for i in range(n - 1, -1, -1):
+            grams, digits[:, i] = np.divmod(grams, base)
+    else:
+        digits = grams
+    raw = np.frombuffer(alphabet, dtype=np.uint8)[digits].tobytes().decode("ascii")
+    return [raw[i:i+n] for i in range(0, len(raw), n)]
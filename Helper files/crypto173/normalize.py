@@ -0,0 +1,85 @@
+'''Fast normalization of text down to its letters.
+
+Text is represented in one of two ways:
+* as a string of letters, which is what the Lab helpers have always used;
+* as a NumPy array of uint8 letter codes, where A/a is 0, B/b is 1, ..., Z/z is 25.
+
+Everything is done with bulk operations (bytes.translate and NumPy table lookups)
+rather than a Python loop over the characters.
+'''
+import string
+
+import numpy as np
+
+from .core import letter_bytes
+
+# Number of characters (or bytes) processed at a time when streaming.
+CHUNK_SIZE = 1 << 20
+
+BOM = b"\xef\xbb\xbf"
+
+# Maps every byte to its letter code, and every non-letter byte to 255.
+_CODE_TABLE = np.full(256, 255, dtype=np.uint8)
+_CODE_TABLE[np.frombuffer(string.ascii_uppercase.encode("ascii"), dtype=np.uint8)] = np.arange(26)
+_CODE_TABLE[np.frombuffer(string.ascii_lowercase.encode("ascii"), dtype=np.uint8)] = np.arange(26)
+
+
+def to_codes(X):
+    '''Returns a uint8 array of the letter codes (0-25) of the letters in X.'''
+    buf = np.frombuffer(letter_bytes(X), dtype=np.uint8)
+    return _CODE_TABLE[buf]
+
+
+def from_codes(codes, case="upper"):
+    '''Converts an array of letter codes back into a string.'''
+    if case == "upper":
+        base = ord('A')
+    elif case == "lower":
+        base = ord('a')
+    else:
+        raise ValueError("case should be 'upper' or 'lower'.")
+    codes = np.asarray(codes, dtype=np.uint8)
+    return (codes + np.uint8(base)).tobytes().decode("ascii")
+
+
+def iter_codes(source, chunk_size=CHUNK_SIZE):
+    '''Yields the letter codes of `source` as a sequence of uint8 arrays.
+    `source` can be a str, a bytes-like object, or a file object opened in
+    text or binary mode.  At most `chunk_size` characters are held at a time
+    (plus the whole of `source` itself, if it is a str or bytes).'''
+    if hasattr(source, "read"):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = (source[i:i+chunk_size] for i in range(0, len(source), chunk_size))
+
+    first = True
+    for chunk in chunks:
+        if first:
+            chunk = _strip_bom(chunk)
+            first = False
+        codes = to_codes(chunk)
+        if len(codes) > 0:
+            yield codes
+
+
+def iter_file_codes(path, chunk_size=CHUNK_SIZE):
+    '''Yields the letter codes of the text file at `path`, one chunk at a time.
+    The file is read in binary mode, so it never has to be decoded.  This is safe
+    for UTF-8 files, because every byte of a multi-byte character is at least 128.'''
+    with open(path, "rb") as f:
+        yield from iter_codes(f, chunk_size=chunk_size)
+
+
+def file_codes(path, chunk_size=CHUNK_SIZE):
+    '''Returns all the letter codes of the text file at `path` as one array.'''
+    parts = list(iter_file_codes(path, chunk_size=chunk_size))
+    if not parts:
+        return np.zeros(0, dtype=np.uint8)
+    return np.concatenate(parts)
+
+
+def _strip_bom(chunk):
+    if isinstance(chunk, str):
+        return chunk[1:] if chunk.startswith("\ufeff") else chunk
+    chunk = bytes(chunk)
+    return chunk[len(BOM):] if chunk.startswith(BOM) else chunk
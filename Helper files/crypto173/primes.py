@@ -0,0 +1,212 @@
+'''Primality testing and random prime generation.
+
+is_prime first divides by the small primes, then runs the Miller-Rabin test.  Below
+2^64 the seven bases found by Jim Sinclair are enough to make the answer exact, and
+below MR_DETERMINISTIC_LIMIT the first 13 primes are; above it, `rounds` random bases
+are used, and a composite number passes each one with probability at most 1/4.
+
+random_prime searches upwards from a random odd starting point.  The residues of the
+start modulo the sieve primes are computed once, and a window of candidates is sieved
+with them, so Miller-Rabin only runs on numbers with no small factor.
+
+Only is_prime_array, which works with NumPy arrays, imports NumPy.
+'''
+import functools
+import math
+import random
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+from .core import factor_out_2
+
+MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+MR_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MR_64_BIT_BASES = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+# Below 2^32, these three bases are enough.
+MR_32_BIT_BASES = (2, 7, 61)
+
+# Candidates are divided by the primes below this before running Miller-Rabin.
+TRIAL_LIMIT = 1000
+# random_prime sieves its windows with the primes below this.
+SIEVE_LIMIT = 1 << 14
+
+
+@functools.lru_cache(maxsize=8)
+def small_primes(limit):
+    '''Returns a tuple of the primes less than `limit`, using the sieve of Eratosthenes.'''
+    if limit <= 2:
+        return ()
+    sieve = bytearray([1]) * limit
+    sieve[0] = sieve[1] = 0
+    for p in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[p]:
+            sieve[p*p::p] = bytes(len(range(p*p, limit, p)))
+    return tuple(i for i, is_p in enumerate(sieve) if is_p)
+
+
+@functools.lru_cache(maxsize=8)
+def _primorial(limit):
+    return math.prod(small_primes(limit))
+
+
+def miller_rabin(n, a, k=None, q=None):
+    '''Returns True if n (odd, greater than 2) passes the Miller-Rabin test to base a,
+    meaning a is not a witness that n is composite.  n - 1 = 2^k * q can be passed
+    in if it is already known.'''
+    if k is None:
+        k, q = factor_out_2(n - 1)
+    x = pow(a, q, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(k - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def is_prime(n, rounds=20, rng=None):
+    '''Returns True if n is prime.  The answer is exact for n below
+    MR_DETERMINISTIC_LIMIT (more than 2^81); above it, `rounds` random Miller-Rabin
+    bases are tried, drawn from `rng` (a random.Random).'''
+    if n < 2:
+        return False
+    if n < TRIAL_LIMIT:
+        return n in _small_prime_set()
+    if math.gcd(n, _primorial(TRIAL_LIMIT)) != 1:
+        return False
+    return _miller_rabin_test(n, rounds, rng)
+
+
+def _miller_rabin_test(n, rounds, rng):
+    k, q = factor_out_2(n - 1)
+    if n < 1 << 64:
+        # A base that is a multiple of n tells us nothing, so it is skipped.
+        return all(miller_rabin(n, a % n, k, q) for a in MR_64_BIT_BASES if a % n)
+    if n < MR_DETERMINISTIC_LIMIT:
+        return all(miller_rabin(n, a, k, q) for a in MR_DETERMINISTIC_BASES)
+    # Base 2 rules out almost every composite, before paying for random bases.
+    if not miller_rabin(n, 2, k, q):
+        return False
+    if rng is None:
+        rng = random
+    return all(miller_rabin(n, rng.randrange(3, n - 1), k, q) for _ in range(rounds))
+
+
+@functools.lru_cache(maxsize=1)
+def _small_prime_set():
+    return frozenset(small_primes(TRIAL_LIMIT))
+
+
+def is_prime_array(candidates):
+    '''Returns a boolean NumPy array saying which entries of `candidates` (an array of
+    non-negative integers below 2^64) are prime.  Trial division by the small primes
+    is vectorized over the whole array, and so is the Miller-Rabin test for the
+    candidates below 2^32, whose products still fit in 64 bits.  Larger candidates that
+    survive trial division are tested one at a time.'''
+    import numpy as np
+
+    candidates = np.asarray(candidates, dtype=np.uint64)
+    result = candidates >= 2
+    for p in small_primes(TRIAL_LIMIT):
+        result &= (candidates % np.uint64(p) != 0) | (candidates == np.uint64(p))
+    result &= _miller_rabin_32(candidates, result)
+    for i in np.flatnonzero(result & (candidates >= np.uint64(1 << 32))):
+        result[i] = _miller_rabin_test(int(candidates[i]), 0, None)
+    return result
+
+
+def _miller_rabin_32(candidates, mask):
+    '''Runs the deterministic Miller-Rabin test on the entries of `candidates` that are
+    below 2^32 and selected by `mask`.  Returns a boolean array, which is True for the
+    other entries.'''
+    import numpy as np
+
+    mask = mask & (candidates < np.uint64(1 << 32)) & (candidates > np.uint64(2))
+    n = candidates[mask]
+    one = np.uint64(1)
+    # Write n - 1 = 2^k * q.
+    q = n - one
+    k = np.zeros(len(n), dtype=np.uint64)
+    while True:
+        even = (q & one) == 0
+        if not even.any():
+            break
+        q[even] >>= one
+        k[even] += one
+    passed = np.ones(len(n), dtype=bool)
+    for a in MR_32_BIT_BASES:
+        base = np.uint64(a) % n
+        # A base that is a multiple of n tells us nothing.
+        ok = base == 0
+        x = np.ones(len(n), dtype=np.uint64)
+        e = q.copy()
+        while e.any():
+            odd = (e & one) == 1
+            x[odd] = x[odd] * base[odd] % n[odd]
+            base = base * base % n
+            e >>= one
+        ok |= (x == one) | (x == n - one)
+        for i in range(1, int(k.max(initial=1))):
+            x = x * x % n
+            ok |= (x == n - one) & (np.uint64(i) < k)
+        passed &= ok
+    out = np.ones(len(candidates), dtype=bool)
+    out[mask] = passed
+    return out
+
+
+def random_prime(bits, rng=None, rounds=20, window=4096):
+    '''Returns a random prime with exactly `bits` bits, whose top two bits are set (so
+    the product of two of them has exactly 2*bits bits, as RSA needs).  `rng` defaults
+    to the operating system's secure random source; pass a random.Random(seed) for
+    reproducible primes.'''
+    if bits < 3:
+        raise ValueError("Primes should have at least 3 bits.")
+    if rng is None:
+        rng = secrets.SystemRandom()
+    if bits <= 16:
+        while True:
+            n = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+            if n < 1 << bits and is_prime(n):
+                return n
+    sieve_primes = small_primes(SIEVE_LIMIT)[1:]
+    halves = _inverses_of_2(SIEVE_LIMIT)
+    while True:
+        start = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+        # Offset i in the window stands for the odd number start + 2*i.
+        composite = bytearray(window)
+        for p, half in zip(sieve_primes, halves):
+            # The first i with start + 2*i divisible by p.
+            i = (-start * half) % p
+            composite[i::p] = b"\x01" * len(range(i, window, p))
+        for i in range(window):
+            n = start + 2*i
+            if n >> bits:
+                break
+            if not composite[i] and _miller_rabin_test(n, rounds, rng):
+                return n
+
+
+@functools.lru_cache(maxsize=1)
+def _inverses_of_2(limit):
+    return tuple(pow(2, -1, p) for p in small_primes(limit)[1:])
+
+
+def random_primes(count, bits, workers=None, seed=None, rounds=20):
+    '''Returns a list of `count` random primes with `bits` bits each, generated in a
+    pool of `workers` processes.  Use workers=1 to generate them in this process.  If
+    `seed` is given, the primes are reproducible (each prime uses its own random.Random
+    seeded from `seed` and its position); otherwise they come from the operating
+    system's secure random source.'''
+    seeds = [None if seed is None else (seed, i) for i in range(count)]
+    args = [(bits, s, rounds) for s in seeds]
+    if workers == 1:
+        return [_random_prime_from_seed(*a) for a in args]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_random_prime_from_seed, *zip(*args)))
+
+
+def _random_prime_from_seed(bits, seed, rounds):
+    rng = None if seed is None else random.Random(f"{seed[0]}-{seed[1]}")
+    return random_prime(bits, rng=rng, rounds=rounds)
@@ -0,0 +1,174 @@
+'''Sliding-window statistics over a stream of letters, for finding where a cipher changes.
+
+ind_co and get_freq look at a whole string, so sliding them along a long ciphertext
+costs O(window) for every position.  Here the letter counts of the window are updated
+as it moves: each new letter adds one to its count and the letter that falls out of
+the window takes one off, which is constant work per letter whatever the window size.
+The index of coincidence and the Mutual Index of Coincidence with English (for all 26
+shifts) then follow from the 26 counts.
+
+The updates are done a block of letters at a time: the +1s and -1s of a block go in a
+(block x 26) array, and a cumulative sum down it gives the counts of every window
+ending in the block.  The stream is read with iter_codes or iter_file_codes, and only
+the last window of letters is kept between blocks, so a stream of any length is
+processed in constant memory.
+
+    python -m crypto173.rolling intercepted.txt --window 500
+
+prints the positions (counted in letters) where the statistics jump.
+'''
+import argparse
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from .corpus_stats import ngram_freq
+from .mic import _ROLL, as_freq_vector
+from .normalize import iter_codes, iter_file_codes
+
+# Number of letters whose windows are worked out together.
+BLOCK_SIZE = 1 << 15
+
+# ends[i] is the number of letters read when the window covered the `window` letters
+# before it; ic is that window's index of coincidence, and mic is its largest Mutual
+# Index of Coincidence with English, which is for the window shifted by `shift`.
+WindowStats = namedtuple("WindowStats", ["ends", "ic", "mic", "shift"])
+
+# The window of letters before `position` and the window after it differ by
+# `distance` (the total variation distance of their letter frequencies, from 0 to 1).
+ChangePoint = namedtuple("ChangePoint", ["position", "distance", "ic_before", "ic_after",
+                                         "shift_before", "shift_after"])
+
+
+class RollingCounts:
+    '''The letter counts of a window of the last `window` letters of a stream.'''
+
+    def __init__(self, window):
+        if window < 2:
+            raise ValueError("The window should have at least 2 letters.")
+        self.window = window
+        self.counts = np.zeros(26, dtype=np.int32)
+        self.seen = 0
+        self._tail = np.zeros(0, dtype=np.uint8)
+
+    def push(self, codes):
+        '''Moves the window over the letter codes `codes`.  Returns (ends, counts), where
+        counts[i] is the array of 26 letter counts of the full window ending after
+        ends[i] letters of the stream, for each full window ending in `codes`.'''
+        codes = np.asarray(codes, dtype=np.uint8)
+        m = len(codes)
+        rows = np.arange(m)
+        deltas = np.zeros((m, 26), dtype=np.int32)
+        deltas[rows, codes] = 1
+        # The letter leaving the window as codes[i] comes in is at ext[i + len(tail) - window].
+        ext = np.concatenate([self._tail, codes])
+        leaving = rows + (len(self._tail) - self.window)
+        full = leaving >= 0
+        deltas[rows[full], ext[leaving[full]]] -= 1
+        counts = np.cumsum(deltas, axis=0, out=deltas)
+        counts += self.counts
+        if m:
+            self.counts = counts[-1].copy()
+        ends = self.seen + 1 + rows
+        self.seen += m
+        self._tail = ext[-self.window:].copy()
+        ready = ends >= self.window
+        return ends[ready], counts[ready]
+
+
+def _blocks(source):
+    '''Yields the letter codes of `source` in blocks of at most BLOCK_SIZE letters.'''
+    chunks = iter_file_codes(source) if isinstance(source, str) else source
+    for chunk in chunks:
+        chunk = np.asarray(chunk, dtype=np.uint8)
+        for i in range(0, len(chunk), BLOCK_SIZE):
+            yield chunk[i:i+BLOCK_SIZE]
+
+
+def _stats(counts, window, circulant):
+    counts = counts.astype(np.float64)
+    ic = (counts * (counts - 1)).sum(axis=1) / (window * (window - 1))
+    scores = (counts @ circulant) / window
+    shift = scores.argmax(axis=1)
+    return ic, scores[np.arange(len(shift)), shift], shift
+
+
+def rolling_stats(source, window=500, ref=None):
+    '''Yields a WindowStats for each block of the stream `source`, covering every full
+    window of `window` letters that ends in the block.  `source` is the path of a text
+    file or an iterable of letter code arrays, such as iter_codes(f).  `ref` is the
+    frequency vector to compare against (by default, English).'''
+    circulant = as_freq_vector(ngram_freq(1) if ref is None else ref)[_ROLL]
+    rolling = RollingCounts(window)
+    for block in _blocks(source):
+        ends, counts = rolling.push(block)
+        if len(ends):
+            yield WindowStats(ends, *_stats(counts, window, circulant))
+
+
+def change_points(source, window=500, threshold=None, ref=None):
+    '''Yields a ChangePoint for each place in the stream `source` where the `window`
+    letters before and the `window` letters after have noticeably different letter
+    frequencies, as happens when the cipher or its key changes.  Candidates are the
+    positions where the distance between the two windows reaches `threshold` (by
+    default 5.5/sqrt(window), well above the variation between two windows of the same
+    English text) and is largest within `window` letters either side.  `source` is as
+    for rolling_stats.  Candidates come out about `window` letters after their position.'''
+    threshold = 5.5 / np.sqrt(window) if threshold is None else threshold
+    circulant = as_freq_vector(ngram_freq(1) if ref is None else ref)[_ROLL]
+    rolling = RollingCounts(window)
+    # The counts of the last `window` windows, whose "after" windows are still coming.
+    previous = np.zeros((0, 26), dtype=np.int32)
+    # The best candidate so far, and the last position that was above the threshold.
+    best = None
+    last_above = None
+    for block in _blocks(source):
+        ends, counts = rolling.push(block)
+        if not len(ends):
+            continue
+        both = np.concatenate([previous, counts])
+        previous = both[-window:].copy()
+        if len(both) <= window:
+            continue
+        # The window ending at p is "before" p, and the one ending at p + window is "after".
+        before, after = both[:-window], both[window:]
+        positions = ends[-len(after):] - window
+        distance = np.abs(after - before).sum(axis=1) / (2 * window)
+        # Split the positions above the threshold into runs, and take the peak of each.
+        above = np.flatnonzero(distance >= threshold)
+        runs = np.split(above, np.flatnonzero(np.diff(above) > 1) + 1) if len(above) else []
+        for run in runs:
+            if best is not None and positions[run[0]] - last_above > window:
+                yield best
+                best = None
+            peak = run[distance[run].argmax()]
+            if best is None or distance[peak] > best.distance:
+                ic, _, shift = _stats(np.stack([before[peak], after[peak]]), window, circulant)
+                best = ChangePoint(int(positions[peak]), float(distance[peak]), float(ic[0]),
+                                   float(ic[1]), int(shift[0]), int(shift[1]))
+            last_above = int(positions[run[-1]])
+        # A candidate is final once `window` positions past it are below the threshold.
+        if best is not None and positions[-1] - last_above > window:
+            yield best
+            best = None
+    if best is not None:
+        yield best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find where the statistics of a long ciphertext change.")
+    parser.add_argument("path", nargs="?", default=None, help="a text file (default: standard input)")
+    parser.add_argument("--window", type=int, default=500)
+    parser.add_argument("--threshold", type=float, default=None)
+    args = parser.parse_args(argv)
+    source = args.path if args.path else iter_codes(sys.stdin.buffer)
+    print(f"{'position':>12} {'distance':>9} {'IC before':>10} {'IC after':>9} {'shift':>9}")
+    for point in change_points(source, args.window, args.threshold):
+        print(f"{point.position:>12} {point.distance:>9.3f} {point.ic_before:>10.4f} "
+              f"{point.ic_after:>9.4f} {point.shift_before:>4} -> {point.shift_after:<3}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+'''Shift cipher on arrays of letter codes.
+
+The string versions (shift_char, shift_string and all_shift_strings) live in core, where
+all 26 translation tables are built once so that shifting a string is a single call to
+translate.  For brute force, all_shifts returns every shift of a text at once as a
+26 x N array of letter codes.
+'''
+import numpy as np
+
+from .normalize import to_codes
+
+
+# _CODE_TABLE[s, c] is the letter code c shifted by s.
+_CODE_TABLE = ((np.arange(26)[:, None] + np.arange(26)[None, :]) % 26).astype(np.uint8)
+
+
+def shift_codes(codes, shift_amt):
+    '''Shifts an array of letter codes by shift_amt.'''
+    return _CODE_TABLE[int(shift_amt) % 26][codes]
+
+
+def all_shifts(X):
+    '''Returns a 26 x N uint8 array whose row s holds the letter codes of X shifted by s.
+    X can be a string (only its letters are kept) or an array of letter codes.'''
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else np.asarray(X, dtype=np.uint8)
+    return _CODE_TABLE[:, codes]
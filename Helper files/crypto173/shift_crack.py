@@ -0,0 +1,72 @@
+'''Cracking many shift ciphertexts at once.
+
+Ciphertexts are processed in batches.  For each batch, the letter counts of every
+ciphertext are found with a single np.bincount, and mut_ind_co_shifts scores every
+shift of every ciphertext, giving a (batch size x 26) score matrix.  Only one batch is
+held in memory at a time, so a file of any size can be streamed through.
+'''
+from collections import namedtuple
+from itertools import islice
+
+import numpy as np
+
+from .core import shift_string
+from .corpus_stats import ngram_freq
+from .mic import as_freq_vector, mut_ind_co_shifts
+from .normalize import _CODE_TABLE
+
+BATCH_SIZE = 10_000
+
+# shift is the amount to shift the ciphertext by to decrypt it, and margin is how
+# far its score is above the second best shift (a rough measure of confidence).
+ShiftCrack = namedtuple("ShiftCrack", ["shift", "margin", "plaintext"])
+
+
+def score_shift_batch(lines, ref=None):
+    '''Returns the (len(lines) x 26) array whose entry (i, s) is the Mutual Index of
+    Coincidence between `ref` (by default, English) and lines[i] shifted by s.
+    Lines without any letters get a row of zeros.'''
+    if ref is None:
+        ref = ngram_freq(1)
+    encoded = [line.encode("ascii", "ignore") for line in lines]
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    # Line ids come from the lengths, so a line may contain newlines of its own.
+    line_ids = np.repeat(np.arange(len(lines)), [len(line) for line in encoded])
+    codes = _CODE_TABLE[buf]
+    is_letter = codes < 26
+    counts = np.bincount(
+        line_ids[is_letter] * 26 + codes[is_letter], minlength=26*len(lines)
+    ).reshape(len(lines), 26)
+    totals = np.maximum(counts.sum(axis=1, keepdims=True), 1)
+    return mut_ind_co_shifts(counts / totals, as_freq_vector(ref))
+
+
+def crack_shift_batch(lines, ref=None):
+    '''Cracks every shift ciphertext in the list `lines`.
+    Returns a list with one ShiftCrack(shift, margin, plaintext) for each line.'''
+    scores = score_shift_batch(lines, ref)
+    shifts = scores.argmax(axis=1)
+    top_two = np.sort(scores, axis=1)[:, -2:]
+    margins = top_two[:, 1] - top_two[:, 0]
+    return [
+        ShiftCrack(shift, margin, shift_string(line, shift))
+        for line, shift, margin in zip(lines, shifts.tolist(), margins.tolist())
+    ]
+
+
+def crack_shifts(source, ref=None, batch_size=BATCH_SIZE):
+    '''Yields a ShiftCrack for each ciphertext in `source`, in order.
+    `source` is either the path of a file with one ciphertext per line (like
+    strings20.txt) or an iterable of ciphertexts.  Blank lines are skipped.
+    At most `batch_size` ciphertexts are held in memory at once.'''
+    if isinstance(source, str):
+        with open(source) as f:
+            yield from crack_shifts(f, ref=ref, batch_size=batch_size)
+        return
+    lines = (line.strip() for line in source)
+    lines = (line for line in lines if line)
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            return
+        yield from crack_shift_batch(batch, ref)
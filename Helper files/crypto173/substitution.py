@@ -0,0 +1,216 @@
+'''Solving monoalphabetic substitution ciphers by hill climbing on quadgram scores.
+
+A candidate decryption key is scored by the sum, over every window of 4 letters in the
+plaintext it gives, of the log-probability of that quadgram in the corpus (from the
+saved quadgram table, see corpus_stats).  Hill climbing swaps the plaintext letters of
+two ciphertext letters, and keeps the swap if the score goes up.
+
+A swap only changes the quadgrams that contain one of the two ciphertext letters, so
+the score of every window is kept in an array, the windows touching each ciphertext
+letter are found once, and each swap rescores just those windows.  Swapping with a
+ciphertext letter that does not occur rescores only the windows of the other one; these
+swaps bring in plaintext letters that no ciphertext letter decrypts to yet, which a
+short ciphertext needs.  The first restart starts from the key that matches letter
+frequencies to English, and the others from that key with START_SWAPS random swaps
+among the letters that occur; they are independent, and run in a process pool.
+
+Keys are written as 26-letter strings: entry i is the plaintext letter for the i-th
+ciphertext letter (so "BCD...ZA" decrypts the shift cipher with shift 25).
+'''
+import functools
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .corpus_stats import TABLES, ngram_freq
+from .normalize import to_codes, from_codes
+
+# Give unseen quadgrams this fraction of a single count.
+UNSEEN_COUNT = 0.01
+# Every restart but the first starts from the frequency key with this many random swaps
+# of letters that occur in the ciphertext.
+START_SWAPS = 4
+
+SubstitutionSolution = namedtuple(
+    "SubstitutionSolution", ["key", "plaintext", "score", "restarts", "seconds"])
+
+
+@functools.lru_cache(maxsize=1)
+def quadgram_log_probs():
+    '''Returns an array, indexed by quadgram code, of the base-10 log-probability of each
+    quadgram in the corpus.'''
+    try:
+        counts = TABLES[4]
+    except KeyError:
+        raise ValueError("No table of 4-gram counts has been built.") from None
+    counts = np.asarray(counts, dtype=np.float64)
+    return np.log10(np.maximum(counts, UNSEEN_COUNT) / counts.sum())
+
+
+def quadgram_score(codes, log_probs=None):
+    '''Returns the total quadgram log-probability of the letter codes `codes`.'''
+    if log_probs is None:
+        log_probs = quadgram_log_probs()
+    if len(codes) < 4:
+        return 0.0
+    c = np.asarray(codes, dtype=np.int64)
+    return float(log_probs[((c[:-3]*26 + c[1:-2])*26 + c[2:-1])*26 + c[3:]].sum())
+
+
+def substitution_decrypt(codes, key):
+    '''Decrypts the letter codes `codes` with `key` (a 26-letter string, or an array of
+    26 codes).  Returns the plaintext codes.'''
+    key = to_codes(key) if isinstance(key, str) else np.asarray(key, dtype=np.uint8)
+    if len(key) != 26:
+        raise ValueError("A substitution key should have 26 letters.")
+    return key[codes]
+
+
+class _Climber:
+    '''The state of one hill climb: the key, and the quadgram code and score of every
+    window of 4 letters in the plaintext it gives.
+
+    If ciphertext letter a sits at offset k of a window, changing its plaintext letter
+    by d changes the window's code by d * 26^(3-k).  So for each ciphertext letter,
+    the weights it carries in every window are found once; swapping the plaintext
+    letters of a and b then moves the codes of the windows containing a or b by
+    (key[b] - key[a]) times the difference of their weights.'''
+
+    def __init__(self, codes, key, log_probs):
+        self.log_probs = log_probs
+        self.key = np.array(key, dtype=np.int64)
+        n_windows = len(codes) - 3
+        offsets = np.arange(4)
+        self.weights = []
+        for c in range(26):
+            starts = (np.flatnonzero(codes == c)[:, None] - offsets).ravel()
+            powers = np.tile(26**(3 - offsets), len(starts) // 4)
+            keep = (starts >= 0) & (starts < n_windows)
+            self.weights.append(np.bincount(
+                starts[keep], weights=powers[keep], minlength=n_windows).astype(np.int64))
+        self._pairs = {}
+        plain = self.key[codes]
+        self.quadgrams = ((plain[:-3]*26 + plain[1:-2])*26 + plain[2:-1])*26 + plain[3:]
+        self.scores = log_probs[self.quadgrams]
+
+    def present(self):
+        '''Returns the ciphertext letters that occur in some window.'''
+        return [c for c in range(26) if self.weights[c].any()]
+
+    def _pair(self, a, b):
+        '''Returns the windows containing a or b, and the weight of a minus that of b in
+        each of them.'''
+        pair = self._pairs.get((a, b))
+        if pair is None:
+            windows = np.flatnonzero(self.weights[a] | self.weights[b])
+            pair = self._pairs[(a, b)] = (windows, self.weights[a][windows] - self.weights[b][windows])
+        return pair
+
+    def try_swap(self, a, b):
+        '''Swaps the plaintext letters of ciphertext letters a and b if that raises the
+        score, rescoring only the windows that contain a or b.  Returns True if it did.'''
+        windows, weight = self._pair(a, b)
+        key = self.key
+        quadgrams = self.quadgrams[windows] + (key[b] - key[a]) * weight
+        new = self.log_probs[quadgrams]
+        if new.sum() > self.scores[windows].sum() + 1e-9:
+            self.scores[windows] = new
+            self.quadgrams[windows] = quadgrams
+            key[a], key[b] = key[b], key[a]
+            return True
+        return False
+
+
+def frequency_key(codes):
+    '''Returns the key (an array of 26 codes) that decrypts the most common letter of
+    `codes` as the most common letter of English, and so on.'''
+    cipher_order = np.argsort(-np.bincount(codes, minlength=26), kind="stable")
+    key = np.empty(26, dtype=np.int64)
+    key[cipher_order] = np.argsort(-ngram_freq(1), kind="stable")
+    return key
+
+
+def hill_climb(codes, rng, log_probs=None, key=None):
+    '''Improves a key for the ciphertext letter codes `codes` by trying every swap of
+    two letters, at least one of which occurs in `codes`, in a random order, and keeping
+    the swaps that raise the score, until a whole pass over them makes no change.
+    Starts from `key` (an array of 26 codes), or a random key from the NumPy Generator
+    `rng`.  Returns (key, score).'''
+    if log_probs is None:
+        log_probs = quadgram_log_probs()
+    key = rng.permutation(26) if key is None else key
+    if len(codes) < 4:
+        return np.array(key), 0.0
+    climber = _Climber(codes, key, log_probs)
+    # Swapping two letters that do not occur in the ciphertext cannot change the score.
+    present = climber.present()
+    absent = [c for c in range(26) if c not in present]
+    pairs = [(a, b) for i, a in enumerate(present) for b in present[i+1:] + absent]
+    improved = True
+    while improved:
+        improved = False
+        for i in rng.permutation(len(pairs)).tolist():
+            if climber.try_swap(*pairs[i]):
+                improved = True
+    return climber.key, float(climber.scores.sum())
+
+
+def solve_substitution(X, restarts=8, workers=None, seed=None):
+    '''Cracks the substitution ciphertext X.  Runs `restarts` hill climbs, from the
+    frequency key and from the frequency key with START_SWAPS random swaps, in a pool of
+    `workers` processes (by default, one per core; use workers=1 to run them in this
+    process).  Returns a SubstitutionSolution with the best key and plaintext (upper-case
+    letters), its quadgram score, the number of restarts and the seconds taken.  `seed`
+    makes the result reproducible.'''
+    start = time.perf_counter()
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else np.asarray(X, dtype=np.uint8)
+    seeds = np.random.SeedSequence(seed).spawn(restarts)
+    swaps = [0] + [START_SWAPS] * (restarts - 1)
+    if workers == 1:
+        results = [_climb_from_seed(codes, s, n) for s, n in zip(seeds, swaps)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_climb_from_seed, [codes] * restarts, seeds, swaps))
+    key, score = max(results, key=lambda result: result[1])
+    return SubstitutionSolution(
+        from_codes(key), from_codes(substitution_decrypt(codes, key)), score, restarts,
+        time.perf_counter() - start)
+
+
+def _climb_from_seed(codes, seed, swaps):
+    rng = np.random.default_rng(seed)
+    key = frequency_key(codes)
+    # The letters that do not occur keep the least common plaintext letters.
+    present = np.flatnonzero(np.bincount(codes, minlength=26))
+    if len(present) > 1:
+        for a, b in rng.choice(present, (swaps, 2)).tolist():
+            key[a], key[b] = key[b], key[a]
+    return hill_climb(codes, rng, key=key)
+
+
+def solve_substitution_batch(texts, workers=None, chunksize=4, **kwargs):
+    '''Solves every ciphertext in `texts` in a pool of `workers` processes, running the
+    restarts for each text in its worker.  Keyword arguments are passed on to
+    solve_substitution.  Returns a list of SubstitutionSolution, in the same order as
+    `texts`.  Use workers=1 to solve them in this process instead.'''
+    kwargs["workers"] = 1
+    if workers == 1:
+        return [solve_substitution(X, **kwargs) for X in texts]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        solve = functools.partial(solve_substitution, **kwargs)
+        return list(executor.map(solve, texts, chunksize=chunksize))
+
+
+def random_substitution_key(rng=None):
+    '''Returns a random substitution key, as a 26-letter string.'''
+    rng = np.random.default_rng(rng)
+    return from_codes(rng.permutation(26))
+
+
+def substitution_encrypt(X, key):
+    '''Encrypts the letters of X (upper-case) with the decryption key `key`.'''
+    key = to_codes(key)
+    inverse = np.argsort(key).astype(np.uint8)
+    return from_codes(inverse[to_codes(X)])
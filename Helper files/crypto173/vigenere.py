@@ -0,0 +1,87 @@
+'''Solving Vigenère ciphers.
+
+The ciphertext is normalized once into an array of letter codes, and every stage works
+on that one buffer:
+1. the key length is estimated from the periodic index of coincidence;
+2. column j (the letters at positions j, j + P, j + 2P, ...) is a shift cipher, and its
+   best shift is found with mut_ind_co_shifts, all P columns at once;
+3. the key is assembled from the shifts;
+4. each column is decrypted through a strided view and written back into its place in
+   the plaintext, which is the same interleaving that weave does for strings.
+'''
+import functools
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .corpus_stats import ngram_freq
+from .keylength import estimate_key_length
+from .mic import as_freq_vector, mut_ind_co_shifts
+from .normalize import from_codes, to_codes
+
+VigenereSolution = namedtuple("VigenereSolution", ["key", "plaintext", "period", "timings"])
+
+
+def column_shifts(codes, period, ref=None):
+    '''Returns an array with the best decryption shift of each of the `period` columns
+    of the letter codes `codes`, judged by the Mutual Index of Coincidence with `ref`.'''
+    if ref is None:
+        ref = ngram_freq(1)
+    columns = np.arange(len(codes)) % period
+    counts = np.bincount(columns * 26 + codes, minlength=26*period).reshape(period, 26)
+    freqs = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+    return mut_ind_co_shifts(freqs, as_freq_vector(ref)).argmax(axis=1)
+
+
+def vigenere_decrypt(codes, key):
+    '''Decrypts the letter codes `codes` with the key `key` (a string or array of codes),
+    one column at a time.  Returns the plaintext codes.'''
+    key = to_codes(key) if isinstance(key, str) else np.asarray(key)
+    plain = np.empty_like(codes)
+    for j, k in enumerate(key.tolist()):
+        plain[j::len(key)] = (codes[j::len(key)] + (26 - k)) % 26
+    return plain
+
+
+def solve_vigenere(X, max_period=40, period=None, ref=None):
+    '''Cracks the Vigenère ciphertext X.  Returns a VigenereSolution with the key and
+    plaintext (both upper-case letters), the key length used, and a dictionary of how
+    many seconds each stage took.  Pass `period` to skip the key length estimate.'''
+    timings = {}
+    start = time.perf_counter()
+
+    codes = to_codes(X) if isinstance(X, (str, bytes)) else np.asarray(X, dtype=np.uint8)
+    start = _lap(timings, "normalize", start)
+
+    if period is None:
+        period = estimate_key_length(codes, min(max_period, max(len(codes) // 2, 1)))
+    start = _lap(timings, "period", start)
+
+    shifts = column_shifts(codes, period, ref)
+    start = _lap(timings, "shifts", start)
+
+    key = (-shifts) % 26
+    plain = vigenere_decrypt(codes, key)
+    start = _lap(timings, "decrypt", start)
+
+    return VigenereSolution(from_codes(key), from_codes(plain), period, timings)
+
+
+def solve_vigenere_batch(texts, workers=None, chunksize=16, **kwargs):
+    '''Solves every ciphertext in `texts` in a pool of `workers` processes.
+    Keyword arguments are passed on to solve_vigenere.  Returns a list of
+    VigenereSolution, in the same order as `texts`.  Use workers=1 to solve
+    them in this process instead.'''
+    if workers == 1:
+        return [solve_vigenere(X, **kwargs) for X in texts]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        solve = functools.partial(solve_vigenere, **kwargs)
+        return list(executor.map(solve, texts, chunksize=chunksize))
+
+
+def _lap(timings, stage, start):
+    now = time.perf_counter()
+    timings[stage] = now - start
+    return now
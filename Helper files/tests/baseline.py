@@ -0,0 +1,74 @@
+'''The original, pure-Python versions of the helpers, copied from Helper3.py before
+they were rewritten.  The tests check the rewritten helpers against these.'''
+import re
+import string
+import textwrap
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+
+
+def only_letters(X, case=None):
+    X = ''.join(c for c in X if c in string.ascii_letters)
+
+    if len(X) == 0:
+        return None
+
+    if case is None:
+        return X
+    elif case == "lower":
+        return X.lower()
+    elif case == "upper":
+        return X.upper()
+
+
+def string_for_code_block(X, linewidth=60):
+    return '\n'.join(textwrap.wrap(X, width=linewidth))
+
+
+def add_spaces(X, width=5, linewidth=60):
+    one_line = ' '.join(textwrap.wrap(X, width=width))
+    many_lines = string_for_code_block(one_line, linewidth=linewidth)
+    return many_lines
+
+
+def shift_char(ch, shift_amt):
+    if ch in string.ascii_lowercase:
+        base = 'a'
+    elif ch in string.ascii_uppercase:
+        base = 'A'
+    else:
+        return ch
+    return chr((ord(ch)-ord(base)+shift_amt)%26+ord(base))
+
+
+def shift_string(X, shift_amt):
+    return ''.join(shift_char(ch, shift_amt) for ch in X)
+
+
+def ind_co(X):
+    X = only_letters(X, case="upper")
+    ctr = count_substrings(X, 1)
+    n = sum(ctr.values())
+    return (1/(n*(n-1)))*sum(f*(f-1) for f in ctr.values())
+
+
+def count_substrings(X, n):
+    if not X:
+        return {}
+    X = only_letters(X)
+    shifts = [X[i:] for i in range(n)]
+    grams = [''.join(chrs) for chrs in zip(*shifts)]
+    return Counter(grams)
+
+
+def kasiski_diffs(Y, case="upper"):
+    Y = only_letters(Y, case=case)
+    ctr = count_substrings(Y, 3)
+    tri_reps = [k for k, v in ctr.items() if v > 1]
+    diffs = []
+    for tri in tri_reps:
+        starts = [m.start() for m in re.finditer(f'(?={tri})', Y)]
+        diffs.extend([abs(x-y) for x, y in combinations(starts, 2)])
+    return np.array(sorted(diffs))
@@ -0,0 +1,50 @@
+import pytest
+
+from crypto173.blocks import block_size, decode_blocks, decode_string, encode_blocks, encode_file
+
+MESSAGES = ["", "a", "Hello, world!", "é∑😀" * 50, "x" * 1000]
+
+
+@pytest.mark.parametrize("modulus, k", [
+    (256, 1), (257, 1), (65535, 1), (65536, 2), (65537, 2), (2**2048 - 1, 255), (2**2048, 256)])
+def test_block_size_is_largest_with_power_at_most_modulus(modulus, k):
+    assert block_size(modulus) == k
+    assert 256**k <= modulus < 256**(k + 1)
+
+
+@pytest.mark.parametrize("modulus", [0, 1, 2, 255])
+def test_block_size_rejects_small_moduli(modulus):
+    with pytest.raises(ValueError, match="at least 256"):
+        block_size(modulus)
+
+
+@pytest.mark.parametrize("modulus", [256, 257, 65536, 3233, 2**61 - 1, 2**1024 + 643])
+@pytest.mark.parametrize("message", MESSAGES)
+def test_round_trip(modulus, message):
+    blocks = list(encode_blocks(message, modulus))
+    assert all(0 <= block < modulus for block in blocks)
+    assert decode_string(blocks, modulus) == message
+
+
+def test_round_trip_of_chunks_and_files(tmp_path):
+    message = "Chunks may split characters: " + "é∑😀" * 100
+    data = message.encode("utf-8")
+    chunks = [data[i:i+7] for i in range(0, len(data), 7)]
+    assert list(encode_blocks(chunks, 3233)) == list(encode_blocks(message, 3233))
+    path = tmp_path / "message.txt"
+    path.write_bytes(data)
+    blocks = list(encode_file(str(path), 256, chunk_size=5))
+    assert b"".join(decode_blocks(blocks, 256)) == data
+
+
+def test_message_of_a_whole_number_of_blocks_gets_a_padding_block():
+    assert len(list(encode_blocks(b"abcd", 2**16))) == 3
+
+
+def test_decode_rejects_bad_blocks():
+    with pytest.raises(ValueError):
+        list(decode_blocks([256], 257))
+    with pytest.raises(ValueError):
+        list(decode_blocks([], 257))
+    with pytest.raises(ValueError):
+        list(decode_blocks([ord("a")], 257))
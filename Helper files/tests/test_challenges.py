@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from crypto173.challenges import (
+    AFFINE_MULTIPLIERS, CIPHERS, challenge_strings, generate_challenges, iter_challenges,
+    join_challenges, main, read_challenges, write_challenges)
+from crypto173.corpus_store import open_corpus
+
+
+def same(a, b):
+    for x, y in zip(a, b):
+        if x is None or y is None or isinstance(x, str):
+            assert x == y
+        else:
+            assert np.array_equal(x, y)
+
+
+def decrypt(challenges, i):
+    '''Returns the plaintext codes of challenge i.'''
+    codes = challenges.codes[challenges.offsets[i]:challenges.offsets[i+1]].astype(np.int64)
+    if challenges.cipher == "shift":
+        return (codes - challenges.keys[i]) % 26
+    if challenges.cipher == "vigenere":
+        key = challenges.keys[challenges.key_offsets[i]:challenges.key_offsets[i+1]]
+        return (codes - np.resize(key, len(codes))) % 26
+    a, b = challenges.keys[i].astype(np.int64)
+    return (codes - b) * pow(int(a), -1, 26) % 26
+
+
+@pytest.mark.parametrize("cipher", CIPHERS)
+def test_same_seed_gives_the_same_challenges(cipher):
+    kwargs = dict(min_length=20, max_length=60, chunk_size=7)
+    first = generate_challenges(30, 5, cipher, **kwargs)
+    same(first, generate_challenges(30, 5, cipher, **kwargs))
+    assert not np.array_equal(first.codes, generate_challenges(30, 6, cipher, **kwargs).codes)
+
+
+@pytest.mark.parametrize("cipher", CIPHERS)
+def test_keys_decrypt_to_the_corpus(cipher):
+    letters = open_corpus().letters
+    challenges = generate_challenges(50, 1, cipher, min_length=10, max_length=80)
+    lengths = np.diff(challenges.offsets)
+    assert lengths.min() >= 10 and lengths.max() <= 80
+    for i in range(50):
+        start = challenges.starts[i]
+        assert np.array_equal(decrypt(challenges, i), letters[start:start + lengths[i]])
+
+
+@pytest.mark.parametrize("cipher", CIPHERS)
+def test_no_key_leaves_the_plaintext_unchanged(cipher):
+    challenges = generate_challenges(5000, 2, cipher, min_length=5, min_period=1, max_period=2)
+    keys = challenges.keys
+    if cipher == "shift":
+        assert keys.min() >= 1
+    elif cipher == "vigenere":
+        assert np.add.reduceat(keys, challenges.key_offsets[:-1], dtype=np.int64).min() > 0
+    else:
+        assert not ((keys[:, 0] == 1) & (keys[:, 1] == 0)).any()
+        assert set(keys[:, 0].tolist()) <= set(AFFINE_MULTIPLIERS.tolist())
+
+
+def test_chunks_join_up():
+    parts = list(iter_challenges(25, 3, "vigenere", chunk_size=10))
+    assert [len(p.offsets) - 1 for p in parts] == [10, 10, 5]
+    same(join_challenges(parts), generate_challenges(25, 3, "vigenere", chunk_size=10))
+
+
+@pytest.mark.parametrize("cipher", CIPHERS)
+def test_files_regenerate_from_the_recorded_seed(tmp_path, cipher):
+    # Without a seed, the key file records one that makes the same files again.
+    path, keys_path = write_challenges(
+        str(tmp_path / "a.txt"), 40, None, cipher, min_length=30, max_length=50, chunk_size=16)
+    with open(keys_path) as f:
+        settings = dict(item.split("=", 1) for item in f.readline()[1:].split())
+    again, again_keys = write_challenges(
+        str(tmp_path / "b.txt"), 40, int(settings["seed"]), cipher, min_length=30,
+        max_length=50, chunk_size=16)
+    with open(path, "rb") as f1, open(again, "rb") as f2:
+        assert f1.read() == f2.read()
+    with open(keys_path, "rb") as f1, open(again_keys, "rb") as f2:
+        assert f1.read() == f2.read()
+
+    challenges = read_challenges(path)
+    expected = generate_challenges(
+        40, int(settings["seed"]), cipher, min_length=30, max_length=50, chunk_size=16)
+    same(challenges[:5], expected[:5])
+    with open(path) as f:
+        assert f.read().splitlines() == challenge_strings(expected)
+
+
+def test_main_writes_the_files(tmp_path, capsys):
+    path = str(tmp_path / "strings.txt")
+    assert main([path, "--count", "20", "--seed", "1", "--length", "44"]) == 0
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 20 and {len(line) for line in lines} == {44}
+    assert lines == challenge_strings(generate_challenges(20, 1, min_length=44))
+    assert "Wrote 20 shift challenges" in capsys.readouterr().out
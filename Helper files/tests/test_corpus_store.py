@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from crypto173.corpus_store import (
+    DEFAULT_CORPUS, build_store, normalize_text, open_corpus, shared_rng, store_paths)
+from crypto173.normalize import to_codes
+
+QUOTE = "’"
+
+
+def starts(text, chunk_size=1 << 20):
+    corpus = normalize_text(text, chunk_size=chunk_size)
+    return corpus.words.tolist(), corpus.sentences.tolist()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64])
+def test_chunks_give_the_same_corpus(chunk_size):
+    text = f"\ufeffIt{QUOTE}s 'tis. Don't stop!  Why? {QUOTE}Go{QUOTE} now. End."
+    whole = normalize_text(text)
+    chunked = normalize_text(text, chunk_size=chunk_size)
+    for a, b in zip(whole, chunked):
+        assert a.dtype == b.dtype
+        assert np.array_equal(a, b)
+    assert whole.letters.tolist() == to_codes(text).tolist()
+
+
+def test_right_single_quote_joins_words():
+    # "It's" is one word, and so is "Don't".
+    assert starts(f"It{QUOTE}s Don't")[0] == [0, 3]
+
+
+def test_lone_continuation_byte_splits_words():
+    # Only the whole UTF-8 sequence of the quote counts, not its last byte.
+    # (The Cyrillic letter Й is D0 99 in UTF-8.)
+    assert normalize_text(b"Ab\x99c").words.tolist() == [0, 2]
+    assert normalize_text("AbЙc").words.tolist() == [0, 2]
+
+
+def test_sentences():
+    assert starts("One. Two? Three! ")[1] == [0, 3, 6]
+    assert starts("")[1] == []
+    assert starts("...")[1] == []
+
+
+def test_store_round_trip(tmp_path):
+    path = tmp_path / "text.txt"
+    path.write_text("The cat sat. It" + QUOTE + "s here!", encoding="utf-8")
+    paths = build_store(str(path), str(tmp_path))
+    assert all(os.path.exists(p) for p in paths.values())
+    corpus = open_corpus(str(path), str(tmp_path))
+    expected = normalize_text(path.read_bytes())
+    for a, b in zip(corpus, expected):
+        assert np.array_equal(a, b)
+
+
+def test_store_paths_follow_size_and_modification_time(tmp_path):
+    path = tmp_path / "text.txt"
+    path.write_text("Some text.")
+    first = store_paths(str(path), str(tmp_path))
+    assert store_paths(str(path), str(tmp_path)) == first
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert store_paths(str(path), str(tmp_path)) != first
+
+
+def test_default_corpus_in_chunks():
+    with open(DEFAULT_CORPUS, "rb") as f:
+        data = f.read()
+    whole = normalize_text(data)
+    chunked = normalize_text(data, chunk_size=4093)
+    for a, b in zip(whole, chunked):
+        assert np.array_equal(a, b)
+
+
+def draw(_):
+    return shared_rng().integers(0, 2**62)
+
+
+def test_forked_workers_get_their_own_shared_rng():
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("fork is not available")
+    shared_rng()
+    with multiprocessing.get_context("fork").Pool(2) as pool:
+        draws = pool.map(draw, range(2), chunksize=1)
+    draws.append(draw(None))
+    assert len(set(draws)) == 3
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from crypto173.discrete_log import (
+    DiscreteLogSolver, discrete_log, discrete_log_batch, element_order)
+
+
+def slow_log(g, h, p):
+    x, power = 0, 1
+    while power != h % p:
+        power = power * g % p
+        x += 1
+    return x
+
+
+def test_discrete_log_matches_brute_force():
+    for p in (101, 1009, 7919):
+        for g in (2, 3, 5, 6):
+            order, _ = element_order(g, p, p - 1)
+            for x in range(0, order, 37):
+                assert discrete_log(g, pow(g, x, p), p) == slow_log(g, pow(g, x, p), p) == x
+
+
+@pytest.mark.parametrize("p, g", [
+    (2**61 - 1, 37), (2**89 - 1, 3), (2**127 - 1, 43), (1000003, 2)])
+def test_discrete_log_large_primes(p, g):
+    rng = random.Random(p)
+    for _ in range(5):
+        x = rng.randrange(p - 1)
+        y = discrete_log(g, pow(g, x, p), p)
+        assert pow(g, y, p) == pow(g, x, p)
+        assert 0 <= y < element_order(g, p, p - 1)[0]
+
+
+def test_small_tables_give_the_same_logs():
+    p, g = 2**61 - 1, 37
+    hs = [pow(g, x, p) for x in (0, 1, 12345, p - 2)]
+    assert discrete_log_batch(g, hs, p, max_table_entries=64) == discrete_log_batch(g, hs, p)
+
+
+def test_batch_reuses_the_tables():
+    p, g = 1000003, 2
+    solver = DiscreteLogSolver(g, p)
+    hs = [pow(g, x, p) for x in range(0, 1000, 7)]
+    logs = solver.logs(hs)
+    tables = dict(solver._tables)
+    assert solver.logs(hs) == logs
+    assert all(solver._tables[q] is table for q, table in tables.items())
+    assert discrete_log_batch(g, hs, p) == logs
+
+
+def test_non_powers_are_rejected():
+    # 4 is a square modulo 7, so 3 (a non-square) is not a power of it.
+    with pytest.raises(ValueError):
+        discrete_log(4, 3, 7)
+    with pytest.raises(ValueError):
+        discrete_log(2**2, 3, 2**61 - 1)
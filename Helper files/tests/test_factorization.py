@@ -0,0 +1,69 @@
+import math
+import random
+
+import pytest
+
+from crypto173.factorization import (
+    factor, factor_batch, pollard_p_minus_1, pollard_rho, trial_division)
+from crypto173.primes import is_prime
+
+
+def product(factors):
+    return math.prod(p**e for p, e in factors)
+
+
+def slow_factor(n):
+    factors, d = [], 2
+    while d * d <= n:
+        e = 0
+        while n % d == 0:
+            n //= d
+            e += 1
+        if e:
+            factors.append((d, e))
+        d += 1
+    if n > 1:
+        factors.append((n, 1))
+    return factors
+
+
+def test_factor_matches_trial_division():
+    for n in list(range(1, 3000)) + random.Random(0).sample(range(10**9, 10**10), 200):
+        assert factor(n) == (slow_factor(n), 1)
+
+
+@pytest.mark.parametrize("n", [
+    2**64 + 1, 2**67 - 1, (2**31 - 1) * (2**61 - 1), 1000003**3 * 999983**2,
+    600851475143, 2**10 * 3**5 * 65537 * (2**61 - 1), (2**32 + 15) * (2**32 + 61),
+    (2**89 - 1)**2 * 3])
+def test_factor_hard_cases(n):
+    result = factor(n)
+    assert result.cofactor == 1
+    assert product(result.factors) == n
+    assert all(is_prime(p) for p, _ in result.factors)
+    assert [p for p, _ in result.factors] == sorted({p for p, _ in result.factors})
+
+
+def test_factor_keeps_an_unfactored_cofactor_when_out_of_time():
+    n = (2**127 - 1) * (2**89 - 1) * (2**107 - 1) * (2**61 - 1) * 12
+    result = factor(n * 1000003 * 1000033, time_budget=0.0)
+    assert product(result.factors) * result.cofactor == n * 1000003 * 1000033
+
+
+@pytest.mark.parametrize("n", [0, -5, 2.0])
+def test_factor_rejects_non_positive_integers(n):
+    with pytest.raises(ValueError):
+        factor(n)
+
+
+def test_pollard_methods_find_a_proper_factor():
+    n = 1000003 * 1000033
+    for d in (pollard_rho(n, random.Random(0)), pollard_p_minus_1(n, 1000)):
+        assert d is not None and 1 < d < n and n % d == 0
+    found, rest = trial_division(2**3 * 7 * 1000003, 100)
+    assert found == [(2, 3), (7, 1)] and rest == 1000003
+
+
+def test_factor_batch_in_process():
+    numbers = [12, 2**64 + 1, 999983 * 1000003]
+    assert factor_batch(numbers, workers=1) == [factor(n) for n in numbers]
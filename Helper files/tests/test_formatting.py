@@ -0,0 +1,57 @@
+import os
+import random
+import string
+
+import pytest
+
+from crypto173 import add_spaces, count_lines, format_page
+from crypto173.core import iter_lines, string_for_code_block
+
+from . import baseline
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                   "Week1", "Week1_Monday.py")
+
+
+def test_add_spaces_matches_baseline():
+    rng = random.Random(12)
+    for _ in range(2000):
+        X = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(0, 200)))
+        width, linewidth = rng.randint(1, 20), rng.randint(1, 70)
+        assert add_spaces(X, width, linewidth) == baseline.add_spaces(X, width, linewidth)
+
+
+def test_add_spaces_with_groups_wider_than_a_line():
+    X = "ABCDEFGHIJKLMNOPQRST"
+    assert add_spaces(X, 10, 5) == baseline.add_spaces(X, 10, 5)
+    assert add_spaces(X, 10, 5).count("\n") == 3
+
+
+def test_add_spaces_with_whitespace_matches_baseline():
+    X = "It is a truth universally acknowledged, that a single man"
+    assert add_spaces(X, 5, 20) == baseline.add_spaces(X, 5, 20)
+    assert string_for_code_block(X, 20) == baseline.string_for_code_block(X, 20)
+
+
+def test_pages_join_up_to_add_spaces():
+    X = "".join(random.Random(13).choices(string.ascii_uppercase, k=1234))
+    lines = add_spaces(X, 5, 50).split("\n")
+    assert count_lines(X, 5, 50) == len(lines)
+    assert list(iter_lines(X, 5, 50)) == lines
+    pages = [format_page(X, page, 7, 5, 50) for page in range(-(-len(lines) // 7))]
+    assert "\n".join(pages) == "\n".join(lines)
+
+
+def test_new_ciphertext_starts_at_page_one():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    rng = random.Random(14)
+    texts = ["".join(rng.choices(string.ascii_uppercase, k=3000)) for _ in range(2)]
+    at = testing.AppTest.from_file(APP, default_timeout=60).run()
+    at.text_area[0].input(texts[0]).run()
+    at.button[0].click().run()
+    at.number_input[0].set_value(2).run()
+    assert at.number_input[0].value == 2
+    # The second text has the same number of pages as the first.
+    at.text_area[0].input(texts[1]).run()
+    at.button[0].click().run()
+    assert at.number_input[0].value == 1
@@ -0,0 +1,24 @@
+import random
+
+import numpy as np
+
+from crypto173 import kasiski_diffs
+
+from . import baseline
+
+
+def test_kasiski_diffs_matches_baseline():
+    rng = random.Random(7)
+    texts = [
+        "THEMTHEMTHEM",
+        "abcabcabcXYZabc",
+        "".join(rng.choice("ABCD") for _ in range(300)),
+        "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(3000)),
+    ]
+    for Y in texts:
+        for case in ("upper", "lower"):
+            assert np.array_equal(kasiski_diffs(Y, case=case), baseline.kasiski_diffs(Y, case=case))
+
+
+def test_kasiski_diffs_no_repeats():
+    assert len(kasiski_diffs("ABCDEFGHIJ")) == 0
@@ -0,0 +1,39 @@
+import random
+import string
+
+import numpy as np
+import pytest
+
+from crypto173 import ind_co
+from crypto173.corpus_store import DEFAULT_CORPUS
+from crypto173.keylength import estimate_key_length, periodic_ic
+from crypto173.normalize import to_codes
+
+from . import baseline
+
+
+def test_ind_co_matches_baseline():
+    rng = random.Random(8)
+    texts = ["AB", "AABB", "Hello, World!",
+             "".join(rng.choice(string.ascii_letters + " ") for _ in range(5000))]
+    for X in texts:
+        assert ind_co(X) == pytest.approx(baseline.ind_co(X))
+
+
+def test_periodic_ic_matches_columns():
+    rng = random.Random(9)
+    X = "".join(rng.choice("ABCDEFG") for _ in range(503))
+    ic = periodic_ic(X, max_period=30)
+    assert np.isnan(ic[0])
+    for P in range(1, 31):
+        columns = [X[k::P] for k in range(P)]
+        expected = np.mean([baseline.ind_co(c) for c in columns])
+        assert ic[P] == pytest.approx(expected)
+
+
+def test_estimate_key_length_finds_the_period():
+    rng = np.random.default_rng(10)
+    plain = to_codes(open(DEFAULT_CORPUS, encoding="utf-8-sig").read()[5000:9000])
+    key = rng.integers(1, 26, 7)
+    cipher = (plain + np.resize(key, len(plain))) % 26
+    assert estimate_key_length(cipher) == 7
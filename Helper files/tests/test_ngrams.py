@@ -0,0 +1,29 @@
+import random
+import string
+
+import pytest
+
+from crypto173 import count_substrings
+
+from . import baseline
+
+
+def random_text(rng, length, letters):
+    return "".join(rng.choice(letters + " ,.\n") for _ in range(length))
+
+
+@pytest.mark.parametrize("letters", [string.ascii_uppercase, string.ascii_lowercase,
+                                     string.ascii_letters, "ABC"])
+@pytest.mark.parametrize("n", [1, 2, 3, 4, 6])
+def test_count_substrings_matches_baseline(letters, n):
+    rng = random.Random(n)
+    for length in (0, 1, 5, 200, 3000):
+        X = random_text(rng, length, letters)
+        if baseline.only_letters(X) is None:
+            # The original raised a TypeError for text with no letters.
+            continue
+        assert dict(count_substrings(X, n)) == dict(baseline.count_substrings(X, n))
+
+
+def test_count_substrings_empty():
+    assert count_substrings("", 2) == {}
@@ -0,0 +1,51 @@
+import random
+import string
+
+import numpy as np
+import pytest
+
+from crypto173 import only_letters
+from crypto173.normalize import file_codes, from_codes, iter_codes, to_codes
+
+from . import baseline
+
+SAMPLES = [
+    "",
+    "123 !?",
+    "Hello, World!",
+    "It is a truth universally acknowledged",
+    "﻿École — naïve café’s “quotes”\n\tTabs",
+]
+
+
+def random_text(rng, length):
+    alphabet = string.ascii_letters + string.digits + " \n.,;'’é—"
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+@pytest.mark.parametrize("case", [None, "lower", "upper"])
+def test_only_letters_matches_baseline(case):
+    rng = random.Random(1)
+    texts = SAMPLES + [random_text(rng, n) for n in (1, 10, 100, 5000)]
+    for X in texts:
+        assert only_letters(X, case=case) == baseline.only_letters(X, case=case)
+
+
+def test_codes_round_trip():
+    X = "The Quick Brown Fox"
+    codes = to_codes(X)
+    assert codes.dtype == np.uint8
+    assert from_codes(codes) == "THEQUICKBROWNFOX"
+    assert from_codes(codes, case="lower") == "thequickbrownfox"
+
+
+def test_iter_codes_matches_to_codes_across_chunks():
+    X = random_text(random.Random(2), 10000)
+    chunks = list(iter_codes(X, chunk_size=7))
+    assert np.array_equal(np.concatenate(chunks), to_codes(X))
+
+
+def test_file_codes(tmp_path):
+    path = tmp_path / "text.txt"
+    path.write_text("﻿Ab, cd’e!", encoding="utf-8")
+    assert from_codes(file_codes(str(path))) == "ABCDE"
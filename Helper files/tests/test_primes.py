@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+import pytest
+
+from crypto173.primes import (
+    MR_DETERMINISTIC_LIMIT, is_prime, is_prime_array, random_prime, random_primes, small_primes)
+
+
+def slow_is_prime(n):
+    return n >= 2 and all(n % d for d in range(2, int(n**0.5) + 1))
+
+
+def test_is_prime_matches_trial_division():
+    assert [n for n in range(20000) if is_prime(n)] == [n for n in range(20000) if slow_is_prime(n)]
+    assert small_primes(20000) == tuple(n for n in range(20000) if slow_is_prime(n))
+
+
+@pytest.mark.parametrize("n", [
+    561, 1105, 3215031751, 2152302898747, 3825123056546413051,
+    318665857834031151167461, MR_DETERMINISTIC_LIMIT,
+    (2**61 - 1) * (2**89 - 1), (2**127 - 1)**2])
+def test_strong_pseudoprimes_and_products_are_composite(n):
+    # Carmichael numbers, and the smallest strong pseudoprimes to the first 4, 5, 9, 12
+    # and 13 prime bases.
+    assert not is_prime(n)
+
+
+@pytest.mark.parametrize("n", [
+    2, 3, 65537, 2**31 - 1, 2**61 - 1, 2**64 - 59, 2**89 - 1, 2**127 - 1, 2**521 - 1])
+def test_primes(n):
+    assert is_prime(n)
+    assert is_prime(n, rng=random.Random(0))
+
+
+def test_is_prime_array_matches_is_prime():
+    rng = np.random.default_rng(0)
+    candidates = np.concatenate([
+        np.arange(5000, dtype=np.uint64),
+        rng.integers(0, 2**32, 3000, dtype=np.uint64),
+        rng.integers(2**32, 2**63, 3000, dtype=np.uint64) | np.uint64(1),
+        np.array([2**64 - 59, 2**64 - 1, 3215031751, 2152302898747], dtype=np.uint64)])
+    expected = [is_prime(int(n)) for n in candidates]
+    assert is_prime_array(candidates).tolist() == expected
+
+
+@pytest.mark.parametrize("bits", [3, 8, 16, 17, 64, 256])
+def test_random_prime_has_top_two_bits_set(bits):
+    p = random_prime(bits, rng=random.Random(bits))
+    assert p.bit_length() == bits
+    assert p >> (bits - 2) == 3
+    assert is_prime(p)
+
+
+def test_random_primes_are_reproducible_from_a_seed():
+    primes = random_primes(4, 128, workers=1, seed=7)
+    assert primes == random_primes(4, 128, workers=1, seed=7)
+    assert primes != random_primes(4, 128, workers=1, seed=8)
+    assert len(set(primes)) == 4
+    with pytest.raises(ValueError):
+        random_prime(2)
@@ -0,0 +1,36 @@
+import random
+import string
+
+import numpy as np
+
+from crypto173 import shift_char, shift_string
+from crypto173.core import all_shift_strings
+from crypto173.normalize import from_codes, to_codes
+from crypto173.shift import all_shifts, shift_codes
+
+from . import baseline
+
+
+def test_shift_string_matches_baseline():
+    rng = random.Random(3)
+    alphabet = string.ascii_letters + string.digits + " .,\n’é"
+    texts = ["", "Y", "Hello, World!", "".join(rng.choice(alphabet) for _ in range(2000))]
+    for X in texts:
+        for shift_amt in (-53, -27, -1, 0, 1, 3, 13, 25, 26, 51, 1000):
+            assert shift_string(X, shift_amt) == baseline.shift_string(X, shift_amt)
+
+
+def test_shift_char_matches_baseline():
+    for ch in string.ascii_letters + "1 é":
+        for shift_amt in range(-30, 30):
+            assert shift_char(ch, shift_amt) == baseline.shift_char(ch, shift_amt)
+
+
+def test_all_shifts_agree_with_shift_string():
+    X = "Attack at dawn"
+    rows = all_shifts(X)
+    assert rows.shape == (26, 12)
+    for s, row in enumerate(rows):
+        assert from_codes(row) == shift_string(X, s).upper().replace(" ", "")
+        assert np.array_equal(shift_codes(to_codes(X), s), row)
+    assert all_shift_strings(X) == [baseline.shift_string(X, s) for s in range(26)]
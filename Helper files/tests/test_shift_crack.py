@@ -0,0 +1,46 @@
+import numpy as np
+
+from crypto173 import shift_string
+from crypto173.corpus_store import DEFAULT_CORPUS
+from crypto173.normalize import from_codes, to_codes
+from crypto173.shift_crack import crack_shift_batch, crack_shifts, score_shift_batch
+
+
+def plaintexts(count, length):
+    with open(DEFAULT_CORPUS, encoding="utf-8-sig") as f:
+        letters = from_codes(to_codes(f.read()[30000:200000]))
+    return [letters[i*length:(i+1)*length] for i in range(count)]
+
+
+def test_crack_shift_batch_recovers_the_shifts():
+    plains = plaintexts(20, 60)
+    shifts = list(range(1, 21))
+    cracks = crack_shift_batch([shift_string(p, s) for p, s in zip(plains, shifts)])
+    assert [c.shift for c in cracks] == [(-s) % 26 for s in shifts]
+    assert [c.plaintext for c in cracks] == plains
+
+
+def test_lines_with_their_own_newlines():
+    plains = plaintexts(3, 80)
+    lines = [shift_string(plains[0][:40] + "\n" + plains[0][40:], 3),
+             shift_string(plains[1], 5),
+             "\n" + shift_string(plains[2], 7) + "\r\n"]
+    scores = score_shift_batch(lines)
+    assert scores.shape == (3, 26)
+    assert [c.shift for c in crack_shift_batch(lines)] == [23, 21, 19]
+    # A line scores the same however its letters are split up.
+    assert np.allclose(scores[1], score_shift_batch([lines[1].replace("A", "A\n")])[0])
+
+
+def test_lines_without_letters_score_zero():
+    scores = score_shift_batch(["", "123", "ABC"])
+    assert not scores[:2].any()
+    assert scores[2].any()
+
+
+def test_crack_shifts_reads_a_file(tmp_path):
+    plains = plaintexts(5, 44)
+    path = tmp_path / "strings.txt"
+    path.write_text("\n\n".join(shift_string(p, 10) for p in plains) + "\n")
+    cracks = list(crack_shifts(str(path), batch_size=2))
+    assert [c.plaintext for c in cracks] == plains
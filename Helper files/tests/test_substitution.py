@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from crypto173 import substitution
+from crypto173.corpus_store import DEFAULT_CORPUS
+from crypto173.normalize import from_codes, to_codes
+from crypto173.substitution import (
+    _climb_from_seed, frequency_key, hill_climb, random_substitution_key, solve_substitution,
+    substitution_decrypt, substitution_encrypt)
+
+
+@pytest.fixture(scope="module")
+def letters():
+    with open(DEFAULT_CORPUS, encoding="utf-8-sig") as f:
+        return to_codes(f.read())
+
+
+def excerpts(letters, count, length, seed):
+    '''Yields (plaintext, key, ciphertext) for `count` random excerpts of the corpus.'''
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        start = int(rng.integers(0, len(letters) - length))
+        plain = from_codes(letters[start:start+length])
+        key = random_substitution_key(rng)
+        yield plain, key, substitution_encrypt(plain, key)
+
+
+def test_solve_substitution_recovers_a_long_text(letters):
+    (plain, key, X), = excerpts(letters, 1, 1000, 0)
+    solution = solve_substitution(X, restarts=4, workers=1, seed=0)
+    assert solution.plaintext == plain
+
+
+def test_hill_climb_brings_in_letters_missing_from_the_key(letters):
+    # Give the plaintext E of a letter that occurs to one that does not, so that no
+    # letter that occurs decrypts to E; only a swap with an absent letter can mend it.
+    (plain, key, X), = excerpts(letters, 1, 150, 1)
+    codes = to_codes(X)
+    key = to_codes(key).astype(np.int64)
+    counts = np.bincount(codes, minlength=26)
+    e = int(np.flatnonzero(key == 4)[0])
+    absent = int(np.flatnonzero(counts == 0)[0])
+    key[e], key[absent] = key[absent], key[e]
+    found, _ = hill_climb(codes, np.random.default_rng(0), key=key)
+    assert from_codes(substitution_decrypt(codes, found)) == plain
+
+
+def test_start_swaps_keep_the_rare_letters_on_absent_ones(letters, monkeypatch):
+    (plain, key, X), = excerpts(letters, 1, 150, 2)
+    codes = to_codes(X)
+    absent = np.bincount(codes, minlength=26) == 0
+    rare = sorted(frequency_key(codes)[absent].tolist())
+    # Return the start key without climbing.
+    monkeypatch.setattr(substitution, "hill_climb", lambda codes, rng, key: (key, 0.0))
+    for seed in np.random.SeedSequence(0).spawn(20):
+        start, _ = _climb_from_seed(codes, seed, 4)
+        assert sorted(start[absent].tolist()) == rare
+
+
+def test_short_texts_are_mostly_solved(letters):
+    texts = list(excerpts(letters, 10, 150, 3))
+    solved = 0
+    for plain, key, X in texts:
+        solution = solve_substitution(X, workers=1, seed=0)
+        solved += np.mean([a == b for a, b in zip(solution.plaintext, plain)]) > 0.95
+    assert solved >= 7
+
+
+def test_climb_from_seed_handles_texts_without_letters():
+    key, score = _climb_from_seed(np.zeros(0, dtype=np.uint8), np.random.SeedSequence(0), 4)
+    assert sorted(key.tolist()) == list(range(26))
+    assert score == 0.0
@@ -0,0 +1,44 @@
+import string
+
+import numpy as np
+import pytest
+
+from crypto173.corpus_store import DEFAULT_CORPUS
+from crypto173.keylength import estimate_key_length
+from crypto173.normalize import from_codes, to_codes
+from crypto173.vigenere import solve_vigenere, solve_vigenere_batch
+
+
+def encrypt(plain, key):
+    return from_codes((to_codes(plain) + np.resize(to_codes(key), len(plain))) % 26)
+
+
+@pytest.fixture(scope="module")
+def plaintext():
+    with open(DEFAULT_CORPUS, encoding="utf-8-sig") as f:
+        return from_codes(to_codes(f.read()[20000:23000]))
+
+
+def test_solve_vigenere_recovers_the_key(plaintext):
+    solution = solve_vigenere(encrypt(plaintext, "LEMON"))
+    assert solution.key == "LEMON"
+    assert solution.period == 5
+    assert solution.plaintext == plaintext
+
+
+def test_solve_vigenere_batch_in_process(plaintext):
+    texts = [encrypt(plaintext, key) for key in ("KEY", "CIPHERS")]
+    keys = [s.key for s in solve_vigenere_batch(texts, workers=1)]
+    assert keys == ["KEY", "CIPHERS"]
+
+
+@pytest.mark.parametrize("X", [string.ascii_uppercase, "ABCDEFGHIJ", "AB"])
+def test_no_repeated_letters_gives_a_positive_period(X):
+    assert estimate_key_length(X) >= 1
+    assert solve_vigenere(X).period >= 1
+
+
+@pytest.mark.parametrize("X", ["", "A"])
+def test_too_short_raises(X):
+    with pytest.raises(ValueError):
+        solve_vigenere(X)
@@ -1,6 +1,17 @@
+import os
 import string
+import sys
 
-from collections import Counter
+import numpy as np
+
+# The shared helper code lives in the crypto173 package in "Helper files".
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Helper files"))
+
+from crypto173 import (
+    only_letters, to_codes, shift_string, all_shift_strings, count_substrings,
+    add_spaces, count_lines, format_page, bar_chart, mic_chart,
+    freq_vector, mut_ind_co_shifts, digest_cache, text_digest, instrument,
+)
 
 letterset = frozenset(string.ascii_letters)
 
@@ -13,23 +24,23 @@ bigramfreq = [('th',168), ('he',132), ('an',92), ('re',91), ('er',88), ('in',86)
 #trigramfreq is based on data from http://www.cryptograms.org/letter-frequencies.php
 trigramfreq = ['the', 'and', 'tha', 'ent', 'ing', 'ion', 'tio', 'for', 'nde', 'has', 'nce', 'edt', 'tis', 'oft', 'sth', 'men']
 
-def only_letters(X, case=None):
-    X = ''.join(c for c in X if c in letterset)
 
-    if len(X) == 0:
+@digest_cache(max_entries=64)
+def analyze_ciphertext(ciphertext):
+    '''Returns everything the Week 1 app shows about `ciphertext`, as a dictionary:
+    the count of each letter, the Mutual Index of Coincidence with English after
+    each shift (entry j is for a shift of j) and its chart, and the 26 shifts of
+    its letters.
+    Results are cached by a hash of the ciphertext, so moving a slider only looks
+    them up.  Returns None if the ciphertext has no letters.'''
+    letters = only_letters(ciphertext, case="upper")
+    if letters is None:
         return None
-    
-    if case is None:
-        return X
-    elif case == "lower":
-        return X.lower()
-    elif case == "upper":
-        return X.upper()
-    
-def count_substrings(X,n):
-    if not X:
-        return {}
-    X = only_letters(X)
-    shifts = [X[i:] for i in range(n)]
-    grams = [''.join(chrs) for chrs in zip(*shifts)]
-    return Counter(grams)
\ No newline at end of file
+    counts = np.bincount(to_codes(letters), minlength=26)
+    scores = mut_ind_co_shifts(counts/counts.sum(), english_freq)
+    return {
+        "counts": counts,
+        "scores": scores,
+        "mic_chart": mic_chart(scores),
+        "shifted": all_shift_strings(letters),
+    }
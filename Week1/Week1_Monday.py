@@ -1,24 +1,26 @@
+import os
+import time
 import streamlit as st
 import string
-import textwrap
 import numpy as np
-import pandas as pd
-import altair as alt
-from importlib import reload
-import CryptoHelper
-reload(CryptoHelper)
 
-from CryptoHelper import english_freq, only_letters, count_substrings
+from CryptoHelper import (
+    english_freq, only_letters, shift_string, add_spaces, count_lines, format_page,
+    bar_chart, analyze_ciphertext, instrument, text_digest,
+)
 
-letterset = frozenset(string.ascii_letters)
+# Developer mode (CRYPTO173_DEV=1 in the environment of the server) shows a timing
+# breakdown of each rerun in the sidebar.  It records calls for the whole process, so
+# it can only be turned on by whoever starts the server, not from the URL.
+DEV = os.environ.get("CRYPTO173_DEV", "") not in ("", "0")
+if DEV:
+    instrument.enable()
+    rerun_start = time.perf_counter()
+    instrument.start_trace()
 
-df_english_freq = pd.DataFrame({"freq": english_freq, "letter": list(string.ascii_lowercase)})
+letterset = frozenset(string.ascii_letters)
 
-freq_chart = alt.Chart(df_english_freq).mark_bar().encode(
-    x="letter",
-    y="freq",
-    tooltip="freq"
-)
+freq_chart = bar_chart(list(string.ascii_lowercase), english_freq)
 
 # def only_letters(X, case=None):
 #     X = ''.join(c for c in X if c in letterset)
@@ -34,14 +36,23 @@ freq_chart = alt.Chart(df_english_freq).mark_bar().encode(
 #         return X.upper()
 
 rng = np.random.default_rng()
-    
-def string_for_code_block(X, linewidth=50):
-    return '\n'.join(textwrap.wrap(X, width=linewidth))
-    
-def add_spaces(X, width=5, linewidth=50):
-    one_line = ' '.join(textwrap.wrap(X, width=width))
-    many_lines = string_for_code_block(one_line, linewidth=linewidth)
-    return many_lines
+
+LINEWIDTH = 50
+LINES_PER_PAGE = 20
+
+def show_paged(X, key, width=5):
+    '''Shows X in a code block one page at a time, so that only the visible part
+    of a long text is formatted and sent to the browser.  Use width=LINEWIDTH
+    to show X without spaces.'''
+    num_pages = max(-(-count_lines(X, width, LINEWIDTH) // LINES_PER_PAGE), 1)
+    page = 1
+    if num_pages > 1:
+        # A digest of the text is part of the key, so a new text starts again at page 1
+        page = st.number_input(f"Page (of {num_pages})", min_value=1, max_value=num_pages,
+                               value=1, step=1, key=f"{key}_{text_digest(X)}")
+    with instrument.span("format_page", len(X)):
+        page_text = format_page(X, page-1, LINES_PER_PAGE, width, LINEWIDTH)
+    st.code(page_text)
 
 def shift_encrypt(X=None, shift_amt = None, spaces=False, key=None):
     if not X:
@@ -57,10 +68,10 @@ def shift_encrypt(X=None, shift_amt = None, spaces=False, key=None):
     if shift_amt is None:
         shift_amt = rng.integers(1,26)
 
-    X = ''.join(chr((ord(ch)-ord('A')+shift_amt)%26+ord('A')) for ch in X)
+    X = shift_string(X, shift_amt)
 
     if spaces:
-        X = add_spaces(X)
+        X = add_spaces(X, linewidth=LINEWIDTH)
 
     if key:
         st.session_state[key] = X
@@ -76,13 +87,13 @@ plaintext = st.text_area(label="Your plaintext here")
 enc_button = st.button(
                         "Encrypt",
                         on_click=shift_encrypt, 
-                        kwargs={"X": plaintext, "shift_amt": None, "spaces": True, "key": "ciphertext"}
+                        kwargs={"X": plaintext, "shift_amt": None, "spaces": False, "key": "ciphertext"}
                     )
 
 try:
     st.markdown('''It's conventional to include spaces every 5th character in the ciphertext, to make the ciphertext easier to look at.''')
 
-    st.code(st.session_state["ciphertext"])
+    show_paged(st.session_state["ciphertext"], "cipher_page")
 except KeyError:
     disp = '''Click the above button to encrypt your plaintext using the shift cipher with a randomly chosen shift amount.'''
     st.text_area(label="Placeholder", value=disp)
@@ -99,51 +110,27 @@ shift_amt = st.slider("Shift amount", min_value=-50, max_value=50, value=0, step
 
 st.write("Here are the letter counts in the shifted ciphertext:")
 
-try:
-    subdict = count_substrings(shift_encrypt(st.session_state["ciphertext"], shift_amt, spaces=False), 1)
-    ser_count = pd.Series(subdict, name="count")
-    df_count = pd.DataFrame(ser_count).reset_index()
-    df_count.rename({"index": "letter"}, axis=1, inplace=True)
+# Computed once per ciphertext; the sliders below only index into it.
+with instrument.span("analyze_ciphertext"):
+    analysis = analyze_ciphertext(st.session_state.get("ciphertext", ""))
 
-    cipher_chart = alt.Chart(df_count).mark_bar().encode(
-        x=alt.X("letter", scale=alt.Scale(domain=list(string.ascii_uppercase))),
+if analysis is not None:
+    # Shifting the text by shift_amt moves the count of each letter shift_amt places along
+    cipher_chart = bar_chart(
+        list(string.ascii_uppercase),
+        np.roll(analysis["counts"], shift_amt%26),
         y="count",
-        tooltip="count"
+        domain=string.ascii_uppercase,
     )
 
     st.altair_chart(cipher_chart, use_container_width=True)
-except KeyError:
-    pass
 
 st.header("Mutual Index of Coincidence")
 
 st.markdown('''For the listed shift amounts, we state the Mutual Index of Coincidence (see Section 5.2 of Hoffstein, Pipher, and Silverman) between this shifted text and "average" English text.  For random text, we expect a Mutual Index of Coincidence of approximately $0.04$.  For English text, we expect a Mutual Index of Coincidence of approximately $0.065$.  For convenience, the values above $0.06$ will be highlighted.''')
 
-try:
-    subdict = count_substrings(st.session_state["ciphertext"], 1)
-    freqs = np.array([subdict.get(c,0) for c in string.ascii_uppercase])
-    freqs = list(freqs/freqs.sum())
-    coins = {}
-    for i in range(-25, 26):
-        j = i%26
-        # Think about why we need the -j here
-        coins[i] = np.dot(english_freq, freqs[-j:]+freqs[:-j])
-    ser = pd.Series(coins, name="score")
-    df_score = pd.DataFrame(ser).reset_index()
-    df_score.rename({"index": "shift_amount"}, axis=1, inplace=True)
-    c = alt.Chart(df_score).mark_bar().encode(
-        x="shift_amount:O",
-        y="score",
-        color = alt.condition(
-            alt.datum.score > 0.06,
-            alt.value("orange"),
-            alt.value("steelblue")
-        ),
-        tooltip = ["shift_amount", "score"]
-    )
-    st.altair_chart(c, use_container_width=True)
-except (KeyError, ValueError):
-    pass
+if analysis is not None:
+    st.altair_chart(analysis["mic_chart"], use_container_width=True)
 
 st.header("Decryption")
 
@@ -151,9 +138,20 @@ st.write("Once we think we know the shift amount, we can attempt to decrypt the
 
 decrypt_amt = st.slider("Shift for decryption", min_value=-50, max_value=50, value=0, step=1)
 
-try:
-    X = shift_encrypt(st.session_state["ciphertext"], decrypt_amt, spaces=False)
-    X_newline = string_for_code_block(X)
-    st.code(X_newline)
-except KeyError:
-    pass
+if analysis is not None:
+    show_paged(analysis["shifted"][decrypt_amt%26], "decrypt_page", width=LINEWIDTH)
+
+if DEV:
+    calls = instrument.stop_trace()
+    with st.sidebar:
+        st.subheader("Timings for this rerun")
+        st.write(f"Whole rerun: {(time.perf_counter() - rerun_start)*1000:.1f} ms")
+        st.caption("Times include the instrumented helpers called inside each function.")
+        st.table([
+            {"function": name, "calls": count, "ms": round(seconds*1000, 3), "bytes": nbytes}
+            for name, count, seconds, nbytes in instrument.summarize(calls)
+        ])
+        st.download_button("All statistics (JSON)", instrument.to_json(indent=2),
+                           file_name="crypto173_stats.json")
+        st.download_button("All statistics (Prometheus)", instrument.to_prometheus(),
+                           file_name="crypto173_stats.txt")